@@ -1,10 +1,17 @@
 """Run enigma."""
+import argparse
+import sys
+from contextlib import closing
+
 from enigma.enigma import Enigma
-from pynput import keyboard
+from enigma.replay import format_report, light_bulb, read_log, replay
 
 
-def main():
+def listen():
     """Listen for keyboard input, output Enigma encoded letter immediately."""
+    # pynput needs a display server; only import it when actually listening
+    from pynput import keyboard
+
     enigma = Enigma()
 
     def on_press(key):
@@ -16,9 +23,7 @@ def main():
         :rtype: bool
         """
         try:
-            key_pressed = key.char.upper()
-            bulb_lit = enigma.press_key(key_pressed)
-            print(f"{key_pressed} --> {bulb_lit}")
+            print(light_bulb(enigma, key.char), flush=True)
         except AttributeError:
             # Non-alphanumeric key pressed
             # If esc, exit listener by returning False, otherwise ignore
@@ -31,5 +36,311 @@ def main():
         listener.join()
 
 
+def replay_log(args):
+    """Replay a keystroke log and report key-to-bulb latencies.
+
+    :param args: parsed command line arguments
+    :type args: argparse.Namespace
+    """
+    enigma = Enigma()
+    with args.log as log:
+        latencies = replay(enigma, read_log(log), timing=args.timing)
+    print(format_report(latencies), file=sys.stderr)
+
+
+def transmit_text(args):
+    """Encrypt text and transmit it as Morse audio.
+
+    :param args: parsed command line arguments
+    :type args: argparse.Namespace
+    """
+    # NumPy is only needed for audio; keep it out of the other commands
+    from enigma.transmit import play_audio, read_text, transmit, write_wav
+
+    with args.input as text_file:
+        audio_chunks = transmit(
+            Enigma(args.start),
+            read_text(text_file),
+            group_size=args.group_size,
+            queue_size=args.queue_size,
+        )
+        # Stop the pipeline's threads even if the output fails
+        with closing(audio_chunks):
+            if args.wav:
+                write_wav(audio_chunks, args.wav)
+            else:
+                play_audio(audio_chunks)
+
+
+def receive_wav(args):
+    """Receive Morse audio from a WAV file and decrypt it.
+
+    :param args: parsed command line arguments
+    :type args: argparse.Namespace
+    """
+    import wave
+
+    from enigma.receive import receive
+
+    with wave.open(args.wav, "rb") as wav_file:
+        letters = receive(
+            Enigma(args.start),
+            wav_file,
+            frequency=args.frequency,
+            dit_freq=args.dit_freq,
+        )
+        with closing(letters):
+            for letter in letters:
+                sys.stdout.write(letter)
+    sys.stdout.write("\n")
+
+
+def encrypt_file(args):
+    """Encrypt a file, resuming an interrupted run if there is one.
+
+    :param args: parsed command line arguments
+    :type args: argparse.Namespace
+    """
+    from enigma.job import EncryptionJob
+
+    job = EncryptionJob(
+        args.input,
+        args.output,
+        start_positions=args.start,
+        block_size=args.block_size,
+        checkpoint_every=args.checkpoint_every,
+    )
+    encrypted = job.run()
+    print(f"Encrypted {encrypted} bytes.", file=sys.stderr)
+
+
+def mix_channels(args):
+    """Write a mix of random Morse transmissions to a WAV file.
+
+    :param args: parsed command line arguments
+    :type args: argparse.Namespace
+    """
+    from enigma.mixer import Mixer, random_channels
+    from enigma.transmit import write_wav
+
+    mixer = Mixer(random_channels(args.channels, args.duration, args.seed))
+    write_wav(mixer.stream(), args.wav)
+
+
+def fuzz_paths(args):
+    """Check fast encryption paths against the reference machine.
+
+    :param args: parsed command line arguments
+    :type args: argparse.Namespace
+    """
+    from enigma.fuzz import run
+
+    throughputs = run(args.trials, args.seed, args.max_length)
+    print(
+        f"All paths match the reference, and find_key() inverts press_key(), "
+        f"in {args.trials} trials."
+    )
+    for name, throughput in throughputs.items():
+        print(f"{name:>24}: {throughput / 1e6:.2f} MB/s")
+
+
+def ciphertext_stats(args):
+    """Report statistics of a ciphertext file.
+
+    :param args: parsed command line arguments
+    :type args: argparse.Namespace
+    """
+    from enigma.stats import file_stats
+
+    print(file_stats(args.input, args.lags, args.period).report())
+
+
+def positive_int(value):
+    """Parse a command line argument as a positive integer.
+
+    :param value: argument value
+    :type value: str
+    :raises argparse.ArgumentTypeError: if the value isn't a positive integer
+    :return: the integer
+    :rtype: int
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(
+            f"must be a positive integer, not {value!r}"
+        )
+    return number
+
+
+def parse_args(argv=None):
+    """Parse command line arguments.
+
+    :param argv: command line arguments; defaults to sys.argv
+    :type argv: list
+    :return: parsed arguments
+    :rtype: argparse.Namespace
+    """
+    parser = argparse.ArgumentParser(
+        prog="enigma", description="An Enigma machine."
+    )
+    parser.set_defaults(func=lambda args: listen())
+    subparsers = parser.add_subparsers(title="commands")
+
+    replay_parser = subparsers.add_parser(
+        "replay", help="replay a keystroke log without a keyboard"
+    )
+    replay_parser.add_argument(
+        "log",
+        type=argparse.FileType("r"),
+        help='keystroke log, one "[seconds] key" per line; - for stdin',
+    )
+    replay_parser.add_argument(
+        "--timing",
+        action="store_true",
+        help="replay keys at their recorded times",
+    )
+    replay_parser.set_defaults(func=replay_log)
+
+    transmit_parser = subparsers.add_parser(
+        "transmit", help="encrypt text and transmit it as Morse audio"
+    )
+    transmit_parser.add_argument(
+        "input",
+        nargs="?",
+        type=argparse.FileType("r"),
+        default="-",
+        help="plaintext file; defaults to stdin",
+    )
+    transmit_parser.add_argument(
+        "--wav", help="write audio to this WAV file instead of playing it"
+    )
+    transmit_parser.add_argument(
+        "--group-size",
+        type=positive_int,
+        default=5,
+        help="ciphertext letters per transmitted group",
+    )
+    transmit_parser.add_argument(
+        "--queue-size",
+        type=positive_int,
+        default=16,
+        help="maximum items waiting between pipeline stages",
+    )
+    transmit_parser.add_argument(
+        "--start", default="AAA", help="rotor start positions, e.g. ABC"
+    )
+    transmit_parser.set_defaults(func=transmit_text)
+
+    receive_parser = subparsers.add_parser(
+        "receive", help="decrypt Morse audio from a WAV file"
+    )
+    receive_parser.add_argument("wav", help="WAV recording of the Morse")
+    receive_parser.add_argument(
+        "--start", default="AAA", help="rotor start positions, e.g. ABC"
+    )
+    receive_parser.add_argument(
+        "--frequency",
+        type=float,
+        default=440,
+        help="carrier frequency in Hz",
+    )
+    receive_parser.add_argument(
+        "--dit-freq", type=float, default=10, help="dits per second"
+    )
+    receive_parser.set_defaults(func=receive_wav)
+
+    encrypt_parser = subparsers.add_parser(
+        "encrypt", help="encrypt a file, resuming if interrupted"
+    )
+    encrypt_parser.add_argument("input", help="plaintext file")
+    encrypt_parser.add_argument("output", help="ciphertext file")
+    encrypt_parser.add_argument(
+        "--start", default="AAA", help="rotor start positions, e.g. ABC"
+    )
+    encrypt_parser.add_argument(
+        "--block-size",
+        type=positive_int,
+        default=1024 * 1024,
+        help="bytes encrypted at a time",
+    )
+    encrypt_parser.add_argument(
+        "--checkpoint-every",
+        type=positive_int,
+        default=16,
+        help="blocks encrypted between checkpoints and syncs to disk",
+    )
+    encrypt_parser.set_defaults(func=encrypt_file)
+
+    mix_parser = subparsers.add_parser(
+        "mix", help="mix random Morse transmissions for load testing"
+    )
+    mix_parser.add_argument("wav", help="WAV file to write the mix to")
+    mix_parser.add_argument(
+        "--channels",
+        type=positive_int,
+        default=64,
+        help="number of transmissions",
+    )
+    mix_parser.add_argument(
+        "--duration",
+        type=float,
+        default=60,
+        help="approximate length of the mix in seconds",
+    )
+    mix_parser.add_argument(
+        "--seed", type=int, help="random seed, for repeatable mixes"
+    )
+    mix_parser.set_defaults(func=mix_channels)
+
+    fuzz_parser = subparsers.add_parser(
+        "fuzz", help="check fast encryption paths against the reference"
+    )
+    fuzz_parser.add_argument(
+        "--trials", type=int, default=100, help="number of random cases"
+    )
+    fuzz_parser.add_argument("--seed", type=int, help="random seed")
+    fuzz_parser.add_argument(
+        "--max-length",
+        type=int,
+        default=1000,
+        help="longest random message in bytes",
+    )
+    fuzz_parser.set_defaults(func=fuzz_paths)
+
+    stats_parser = subparsers.add_parser(
+        "stats", help="letter statistics of a ciphertext file"
+    )
+    stats_parser.add_argument("input", help="ciphertext file")
+    stats_parser.add_argument(
+        "--lags",
+        type=int,
+        nargs="+",
+        default=[1, 2, 3, 26],
+        help="lags (in letters) to autocorrelate at",
+    )
+    stats_parser.add_argument(
+        "--period",
+        type=int,
+        default=26,
+        help="length of the stepping cycle to bucket letters by",
+    )
+    stats_parser.set_defaults(func=ciphertext_stats)
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Run the interactive machine, or the command given.
+
+    :param argv: command line arguments; defaults to sys.argv
+    :type argv: list
+    """
+    args = parse_args(argv)
+    args.func(args)
+
+
 if __name__ == "__main__":
     main()
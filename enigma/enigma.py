@@ -1,24 +1,56 @@
 """An Enigma machine."""
 
-from itertools import cycle
+from itertools import cycle, islice
 from string import ascii_uppercase as ALPHABET
 
 ROTOR_LEN = len(ALPHABET)
 
+# Pin number of each byte value: A-Z and a-z map to pins 0-25, anything else
+# to -1. Used to encrypt bytes without decoding them to str
+BYTE_PINS = [
+    ALPHABET.find(chr(byte).upper()) if chr(byte).isalpha() and byte < 128
+    else -1
+    for byte in range(256)
+]
+
 
 class Enigma:
     """An Enigma machine."""
 
-    def __init__(self):
+    def __init__(self, start_positions=None):
         """Initialise the machine components.
 
         Rotor wiring taken from https://en.wikipedia.org/wiki/Enigma_rotor_deta
         ils#Turnover_notch_positions
+        :param start_positions: starting letters of rotors 1, 2 and 3, e.g.
+            "ABC"; defaults to all rotors at position zero ("AAA")
+        :type start_positions: str, optional
         """
         self.rotor1 = Rotor("DMTWSILRUYQNKFEJCAZBPGXOHV", "Q")
         self.rotor2 = Rotor("HQZGPJTMOBLNCIFDYAWVEUSRKX", "E")
         self.rotor3 = Rotor("UQNTLSZFMREHDPXKIBVYGJCWOA", "V")
 
+        if start_positions is not None:
+            self.set_positions(start_positions)
+
+    def set_positions(self, positions):
+        """Set the positions of the rotors.
+
+        :param positions: letters of rotors 1, 2 and 3, e.g. "ABC"
+        :type positions: str
+        :raises ValueError: if positions isn't three letters
+        """
+        positions = positions.upper()
+        if len(positions) != 3 or any(p not in ALPHABET for p in positions):
+            raise ValueError(
+                f"Rotor positions must be three letters, not {positions!r}"
+            )
+
+        for rotor, letter in zip(
+            (self.rotor1, self.rotor2, self.rotor3), positions
+        ):
+            rotor.set_position(ALPHABET.find(letter))
+
     def press_key(self, letter_input):
         """Press a key on the machine.
 
@@ -44,6 +76,83 @@ class Enigma:
         letter_output = ALPHABET[r3_output_pos0]
         return letter_output
 
+    def encrypt_into(self, src, dst):
+        """Encrypt bytes from one buffer into another.
+
+        Equivalent to pressing a key for each letter of src, but reads and
+        writes the buffers directly: src and dst can be any objects supporting
+        the buffer protocol (bytes, bytearray, memoryview, mmap, ...), and no
+        intermediate strings or lists are created. Letters are encrypted with
+        their case preserved; other bytes are copied unchanged and don't step
+        the rotors. src and dst may be the same buffer to encrypt in place,
+        but must not otherwise overlap.
+        :param src: plaintext bytes
+        :type src: bytes-like
+        :param dst: writable buffer at least as long as src
+        :type dst: bytes-like
+        :raises ValueError: if dst is shorter than src
+        :return: number of bytes processed
+        :rtype: int
+        """
+        src_view = memoryview(src).cast("B")
+        dst_view = memoryview(dst).cast("B")
+        length = len(src_view)
+        if len(dst_view) < length:
+            raise ValueError("Destination buffer is smaller than source.")
+
+        # Work on local copies of the rotor state; see step_rotors()
+        p1 = self.rotor1.position
+        p2 = self.rotor2.position
+        p3 = self.rotor3.position
+        notch1 = self.rotor1.turnover_notch
+        notch2 = self.rotor2.turnover_notch
+        table1 = self.rotor1.trace_table
+        table2 = self.rotor2.trace_table
+        table3 = self.rotor3.trace_table
+        byte_pins = BYTE_PINS
+
+        for i in range(length):
+            byte = src_view[i]
+            pin = byte_pins[byte]
+            if pin < 0:
+                dst_view[i] = byte
+                continue
+
+            if p1 == notch1:
+                if p2 == notch2:
+                    p3 = (p3 + 1) % ROTOR_LEN
+                p2 = (p2 + 1) % ROTOR_LEN
+            p1 = (p1 + 1) % ROTOR_LEN
+
+            pin = table3[p3][table2[p2][table1[p1][pin]]]
+            # Keep the case of the input letter: "a" is 32 after "A"
+            dst_view[i] = pin + (byte & 0x60) + 1
+
+        self.rotor1.set_position(p1)
+        self.rotor2.set_position(p2)
+        self.rotor3.set_position(p3)
+        return length
+
+    def find_key(self, bulb_lit):
+        """Find the key that lights a bulb.
+
+        The inverse of press_key(): rotors step in the same way, but the pin
+        is traced backwards from the bulb through the rotors. The machine has
+        no reflector, so this is how ciphertext is decrypted.
+        :param bulb_lit: the letter bulb that lit up
+        :type bulb_lit: str
+        :return: the key that was pressed
+        :rtype: str
+        """
+        self.step_rotors()
+
+        r3_output_pos0 = ALPHABET.find(bulb_lit)
+        r2_output_pos0 = self.rotor3.trace_back(r3_output_pos0)
+        r1_output_pos0 = self.rotor2.trace_back(r2_output_pos0)
+        r1_input_pos0 = self.rotor1.trace_back(r1_output_pos0)
+
+        return ALPHABET[r1_input_pos0]
+
     def step_rotors(self):
         """Step rotors forward.
 
@@ -98,11 +207,32 @@ class Rotor:
             output_pin_order.append(ALPHABET.find(letter))
 
         self.wiring = dict(zip(range(ROTOR_LEN), output_pin_order))
+        self.inverse_wiring = dict(zip(output_pin_order, range(ROTOR_LEN)))
+
+        # Output pin (relative to position 0) for each rotor position and
+        # input pin, as given by trace()
+        self.trace_table = [
+            [
+                (self.wiring[(pin + position) % ROTOR_LEN] + position)
+                % ROTOR_LEN
+                for pin in range(ROTOR_LEN)
+            ]
+            for position in range(ROTOR_LEN)
+        ]
 
     def step(self):
         """Advance the rotor by one."""
         self.position = next(self.positions)
 
+    def set_position(self, position):
+        """Turn the rotor to a position.
+
+        :param position: position of the rotor, from 0 to 25
+        :type position: int
+        """
+        self.positions = islice(cycle(range(ROTOR_LEN)), position, None)
+        self.step()
+
     def trace(self, input_pin_pos0):
         """Trace an input pin through the rotor to an output pin.
 
@@ -127,3 +257,21 @@ class Rotor:
         # Take into account possibly going around the rotor more than once
         output_pin_pos0 = (output_pin + self.position) % ROTOR_LEN
         return output_pin_pos0
+
+    def trace_back(self, output_pin_pos0):
+        """Trace an output pin back through the rotor to its input pin.
+
+        :param output_pin_pos0: output pin relative to position 0 of the rotor
+        :type output_pin_pos0: int
+        :return: input pin relative to position 0 of the rotor
+        :rtype: int
+        """
+        # Output pin relative to rotor, as in trace()
+        output_pin = (output_pin_pos0 - self.position) % ROTOR_LEN
+
+        # Trace output pin back to input, relative to rotor
+        input_pin = self.inverse_wiring[output_pin]
+
+        # Return input pin relative to position 0 of rotor
+        input_pin_pos0 = (input_pin - self.position) % ROTOR_LEN
+        return input_pin_pos0
@@ -0,0 +1,341 @@
+"""Check fast encryption paths against the reference machine.
+
+The reference is pressing keys one at a time on an Enigma with press_key().
+Each fast path is given the same randomly generated start positions and
+message, split at random chunk boundaries, and its ciphertext and final rotor
+positions must match the reference exactly. find_key(), the inverse of
+press_key(), is checked in the same cases by decrypting the reference
+ciphertext back to the message. Start positions are biased towards the
+turnover notches, and every run includes a message covering the full period
+of the rotors, so all stepping cases are exercised.
+"""
+import os
+import random
+import tempfile
+import time
+from string import ascii_uppercase as ALPHABET
+
+from enigma.enigma import ROTOR_LEN, Enigma
+from enigma.job import EncryptionJob
+
+# Key presses before the rotors return to their start positions
+ROTOR_PERIOD = ROTOR_LEN ** 3
+
+# Characters of random messages; letters are most likely
+MESSAGE_CHARS = ALPHABET * 4 + ALPHABET.lower() * 2 + " .,!0123456789\n"
+
+
+class EquivalenceError(AssertionError):
+    """A fast path doesn't match the reference machine."""
+
+
+def random_case(rng, max_length):
+    """Generate a random start state, message and chunk boundaries.
+
+    :param rng: random number generator
+    :type rng: random.Random
+    :param max_length: longest message in bytes
+    :type max_length: int
+    :return: start positions, message and chunk boundaries
+    :rtype: tuple
+    """
+    enigma = Enigma()
+    positions = []
+    for rotor in (enigma.rotor1, enigma.rotor2, enigma.rotor3):
+        if rng.random() < 0.5:
+            # At or just before the turnover notch
+            position = (rotor.turnover_notch - rng.randrange(2)) % ROTOR_LEN
+        else:
+            position = rng.randrange(ROTOR_LEN)
+        positions.append(ALPHABET[position])
+
+    length = rng.randrange(max_length + 1)
+    message = "".join(rng.choice(MESSAGE_CHARS) for _ in range(length))
+    message = message.encode()
+    if message and rng.random() < 0.1:
+        # Occasionally include arbitrary bytes
+        message += bytes(rng.randrange(256) for _ in range(16))
+
+    bounds = sorted(
+        rng.randrange(len(message) + 1) for _ in range(rng.randrange(8))
+    )
+    return "".join(positions), message, bounds
+
+
+def is_letter(char):
+    """Whether a character is a key on the machine, in either case.
+
+    :param char: character
+    :type char: str
+    :return: True if char is an ASCII letter
+    :rtype: bool
+    """
+    return char.isascii() and char.isalpha()
+
+
+def rotor_positions(enigma):
+    """Positions of a machine's rotors.
+
+    :param enigma: the machine
+    :type enigma: enigma.enigma.Enigma
+    :return: positions of rotors 1, 2 and 3
+    :rtype: tuple
+    """
+    return (
+        enigma.rotor1.position,
+        enigma.rotor2.position,
+        enigma.rotor3.position,
+    )
+
+
+def reference(start_positions, message, bounds):
+    """Encrypt a message by pressing keys one at a time.
+
+    Letters keep their case; other bytes are unchanged.
+    :param start_positions: rotor start positions
+    :type start_positions: str
+    :param message: plaintext
+    :type message: bytes
+    :param bounds: chunk boundaries (unused)
+    :type bounds: list
+    :return: ciphertext and final rotor positions
+    :rtype: tuple
+    """
+    enigma = Enigma(start_positions)
+    ciphertext = []
+    for char in message.decode("latin-1"):
+        if is_letter(char):
+            bulb = enigma.press_key(char.upper())
+            ciphertext.append(bulb if char.isupper() else bulb.lower())
+        else:
+            ciphertext.append(char)
+
+    return "".join(ciphertext).encode("latin-1"), rotor_positions(enigma)
+
+
+def encrypt_into_whole(start_positions, message, bounds):
+    """Encrypt a message with one call to encrypt_into().
+
+    :param start_positions: rotor start positions
+    :type start_positions: str
+    :param message: plaintext
+    :type message: bytes
+    :param bounds: chunk boundaries (unused)
+    :type bounds: list
+    :return: ciphertext and final rotor positions
+    :rtype: tuple
+    """
+    enigma = Enigma(start_positions)
+    ciphertext = bytearray(len(message))
+    enigma.encrypt_into(message, ciphertext)
+    return bytes(ciphertext), rotor_positions(enigma)
+
+
+def encrypt_into_chunked(start_positions, message, bounds):
+    """Encrypt a message in chunks, in place.
+
+    :param start_positions: rotor start positions
+    :type start_positions: str
+    :param message: plaintext
+    :type message: bytes
+    :param bounds: chunk boundaries
+    :type bounds: list
+    :return: ciphertext and final rotor positions
+    :rtype: tuple
+    """
+    enigma = Enigma(start_positions)
+    buffer = bytearray(message)
+    view = memoryview(buffer)
+    for start, end in zip([0] + bounds, bounds + [len(buffer)]):
+        enigma.encrypt_into(view[start:end], view[start:end])
+    return bytes(buffer), rotor_positions(enigma)
+
+
+def encryption_job(start_positions, message, bounds):
+    """Encrypt a message as a file, interrupting and resuming the job.
+
+    The block size is the length of the first chunk. The job is stopped
+    after one block and resumed by a new job, as after a restart.
+    :param start_positions: rotor start positions
+    :type start_positions: str
+    :param message: plaintext
+    :type message: bytes
+    :param bounds: chunk boundaries
+    :type bounds: list
+    :return: ciphertext and final rotor positions
+    :rtype: tuple
+    """
+    block_size = max(1, bounds[0] if bounds else len(message))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        input_path = os.path.join(tmp_dir, "plain")
+        output_path = os.path.join(tmp_dir, "cipher")
+        with open(input_path, "wb") as f:
+            f.write(message)
+
+        EncryptionJob(
+            input_path, output_path, start_positions, block_size
+        ).run(max_blocks=1)
+        job = EncryptionJob(
+            input_path, output_path, start_positions, block_size
+        )
+        job.run()
+
+        with open(output_path, "rb") as f:
+            ciphertext = f.read()
+
+    return ciphertext, rotor_positions(job.enigma)
+
+
+def first_difference(actual, expected):
+    """Offset of the first byte at which two byte strings differ.
+
+    :param actual: bytes produced
+    :type actual: bytes
+    :param expected: bytes expected
+    :type expected: bytes
+    :return: offset of the first difference, or the shorter length if one is
+        a prefix of the other
+    :rtype: int
+    """
+    return next(
+        (i for i, (a, b) in enumerate(zip(actual, expected)) if a != b),
+        min(len(actual), len(expected)),
+    )
+
+
+def check_inverse(start_positions, message, ciphertext, positions):
+    """Check find_key() decrypts the reference ciphertext.
+
+    find_key() is the inverse of press_key() rather than a fast path, so it
+    is checked by decrypting the ciphertext back to the message.
+    :param start_positions: rotor start positions
+    :type start_positions: str
+    :param message: plaintext
+    :type message: bytes
+    :param ciphertext: reference ciphertext of the message
+    :type ciphertext: bytes
+    :param positions: reference final rotor positions
+    :type positions: tuple
+    :raises EquivalenceError: if decryption doesn't recover the message
+    """
+    enigma = Enigma(start_positions)
+    plaintext = bytearray(ciphertext)
+    for i, byte in enumerate(ciphertext):
+        char = chr(byte)
+        if is_letter(char):
+            key = enigma.find_key(char.upper())
+            plaintext[i] = ord(key if char.isupper() else key.lower())
+
+    if plaintext != message:
+        raise EquivalenceError(
+            "find_key() decrypts to a different message at byte "
+            f"{first_difference(plaintext, message)} with start positions "
+            f"{start_positions}"
+        )
+    if rotor_positions(enigma) != positions:
+        raise EquivalenceError(
+            f"find_key() ends with rotor positions {rotor_positions(enigma)}, "
+            f"not {positions}, with start positions {start_positions}"
+        )
+
+
+# Fast paths to check, by name
+FAST_PATHS = {
+    "encrypt_into": encrypt_into_whole,
+    "encrypt_into (chunked)": encrypt_into_chunked,
+    "EncryptionJob": encryption_job,
+}
+
+
+def check_case(start_positions, message, bounds, paths=None):
+    """Check the fast paths against the reference for one case.
+
+    find_key() is also checked against the reference ciphertext, untimed.
+    :param start_positions: rotor start positions
+    :type start_positions: str
+    :param message: plaintext
+    :type message: bytes
+    :param bounds: chunk boundaries
+    :type bounds: list
+    :param paths: fast paths by name; defaults to FAST_PATHS
+    :type paths: dict, optional
+    :raises EquivalenceError: if a fast path doesn't match
+    :return: seconds taken by each path, including "reference"
+    :rtype: dict
+    """
+    if paths is None:
+        paths = FAST_PATHS
+
+    start = time.perf_counter()
+    expected = reference(start_positions, message, bounds)
+    seconds = {"reference": time.perf_counter() - start}
+
+    check_inverse(start_positions, message, *expected)
+
+    for name, path in paths.items():
+        start = time.perf_counter()
+        actual = path(start_positions, message, bounds)
+        seconds[name] = time.perf_counter() - start
+
+        if actual[0] != expected[0]:
+            offset = first_difference(actual[0], expected[0])
+            raise EquivalenceError(
+                f"{name} differs from the reference at byte {offset} with "
+                f"start positions {start_positions} and chunk boundaries "
+                f"{bounds}"
+            )
+        if actual[1] != expected[1]:
+            raise EquivalenceError(
+                f"{name} ends with rotor positions {actual[1]}, not "
+                f"{expected[1]}, with start positions {start_positions}"
+            )
+
+    return seconds
+
+
+def run(trials=100, seed=None, max_length=1000, paths=None):
+    """Check the fast paths against the reference for random cases.
+
+    As well as the random cases, one message covers a full rotor period.
+    find_key() is checked in every case, but isn't a fast path, so has no
+    throughput.
+    :param trials: number of random cases
+    :type trials: int
+    :param seed: random seed; reported in any failure
+    :type seed: int, optional
+    :param max_length: longest random message in bytes
+    :type max_length: int
+    :param paths: fast paths by name; defaults to FAST_PATHS
+    :type paths: dict, optional
+    :raises EquivalenceError: if a fast path doesn't match
+    :return: throughput of each path in bytes per second
+    :rtype: dict
+    """
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+    rng = random.Random(seed)
+
+    cases = [random_case(rng, max_length) for _ in range(trials)]
+
+    # Step through every rotor position, from a random start
+    start_positions = "".join(rng.choice(ALPHABET) for _ in range(3))
+    message = "".join(rng.choice(ALPHABET) for _ in range(ROTOR_PERIOD))
+    bounds = sorted(rng.randrange(ROTOR_PERIOD) for _ in range(4))
+    cases.append((start_positions, message.encode(), bounds))
+
+    total_bytes = 0
+    total_seconds = {}
+    for case in cases:
+        try:
+            seconds = check_case(*case, paths=paths)
+        except EquivalenceError as e:
+            raise EquivalenceError(f"{e} (seed {seed})") from None
+
+        total_bytes += len(case[1])
+        for name, elapsed in seconds.items():
+            total_seconds[name] = total_seconds.get(name, 0) + elapsed
+
+    return {
+        name: total_bytes / elapsed if elapsed else float("inf")
+        for name, elapsed in total_seconds.items()
+    }
@@ -0,0 +1,218 @@
+"""Resumable encryption of large files.
+
+An EncryptionJob encrypts a file in blocks with Enigma.encrypt_into(). Every
+few blocks the output is synced to disk and a checkpoint is written next to
+it, recording how far the job has got and the positions of the rotors. If the
+job is interrupted, running it again resumes from the last checkpoint, and the
+output is identical to that of an uninterrupted run. The checkpoint also
+records the size and modification time of the input, so a job isn't resumed
+if the input has changed since.
+"""
+import json
+import os
+
+from enigma.enigma import Enigma
+
+# Bytes encrypted at a time
+BLOCK_SIZE = 1024 * 1024
+
+# Blocks encrypted between checkpoints
+CHECKPOINT_EVERY = 16
+
+# Appended to the output path to give the checkpoint path
+CHECKPOINT_SUFFIX = ".checkpoint"
+
+
+class EncryptionJob:
+    """Encrypt a file, checkpointing progress so it can be resumed."""
+
+    def __init__(
+        self,
+        input_path,
+        output_path,
+        start_positions="AAA",
+        block_size=BLOCK_SIZE,
+        checkpoint_every=CHECKPOINT_EVERY,
+    ):
+        """Set up the job.
+
+        :param input_path: path of the plaintext file
+        :type input_path: str
+        :param output_path: path of the ciphertext file
+        :type output_path: str
+        :param start_positions: rotor start positions, e.g. "ABC"
+        :type start_positions: str
+        :param block_size: bytes encrypted at a time
+        :type block_size: int
+        :param checkpoint_every: blocks encrypted between checkpoints
+        :type checkpoint_every: int
+        :raises ValueError: if block_size or checkpoint_every is less than 1
+        """
+        if block_size < 1 or checkpoint_every < 1:
+            raise ValueError(
+                "Block size and checkpoint interval must be at least 1."
+            )
+
+        self.input_path = str(input_path)
+        self.output_path = str(output_path)
+        self.checkpoint_path = self.output_path + CHECKPOINT_SUFFIX
+        self.start_positions = start_positions.upper()
+        self.block_size = block_size
+        self.checkpoint_every = checkpoint_every
+        self.enigma = Enigma(self.start_positions)
+
+    def run(self, max_blocks=None):
+        """Encrypt the input, resuming from a checkpoint if there is one.
+
+        The checkpoint is removed once the job is complete.
+        :param max_blocks: stop after this many blocks, leaving a checkpoint
+            to resume from; defaults to running to completion
+        :type max_blocks: int, optional
+        :raises ValueError: if the input and output are the same file
+        :return: number of bytes encrypted by this run
+        :rtype: int
+        """
+        # Opening the output would truncate the input before it's read
+        if os.path.exists(self.output_path) and os.path.samefile(
+            self.input_path, self.output_path
+        ):
+            raise ValueError(
+                f"Input {self.input_path} and output {self.output_path} are "
+                "the same file."
+            )
+
+        input_stat = os.stat(self.input_path)
+        input_size = input_stat.st_size
+        checkpoint = self.read_checkpoint(input_stat)
+        if checkpoint is None:
+            offset = 0
+            output_mode = "wb"
+        else:
+            offset = checkpoint["offset"]
+            self.enigma.rotor1.set_position(checkpoint["rotor1"])
+            self.enigma.rotor2.set_position(checkpoint["rotor2"])
+            self.enigma.rotor3.set_position(checkpoint["rotor3"])
+            output_mode = "r+b"
+
+        start_offset = offset
+        block = bytearray(self.block_size)
+        with open(self.input_path, "rb") as input_file, open(
+            self.output_path, output_mode
+        ) as output_file:
+            # Discard anything written after the checkpoint
+            output_file.truncate(offset)
+            output_file.seek(offset)
+            input_file.seek(offset)
+
+            blocks = 0
+            while max_blocks is None or blocks < max_blocks:
+                length = input_file.readinto(block)
+                if not length:
+                    break
+
+                view = memoryview(block)[:length]
+                self.enigma.encrypt_into(view, view)
+                output_file.write(view)
+                offset += length
+
+                blocks += 1
+                if blocks % self.checkpoint_every == 0:
+                    self.sync(output_file)
+                    self.write_checkpoint(offset, input_stat)
+
+            self.sync(output_file)
+
+        if offset < input_size:
+            # Stopped early
+            self.write_checkpoint(offset, input_stat)
+        elif os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+
+        return offset - start_offset
+
+    def read_checkpoint(self, input_stat):
+        """Read the checkpoint of an interrupted run.
+
+        :param input_stat: status of the input file
+        :type input_stat: os.stat_result
+        :raises ValueError: if the checkpoint is from a different job, or the
+            output is shorter than the checkpoint says
+        :return: checkpoint, or None if there isn't one
+        :rtype: dict
+        """
+        if not os.path.exists(self.checkpoint_path):
+            return None
+
+        with open(self.checkpoint_path) as f:
+            checkpoint = json.load(f)
+
+        if (
+            checkpoint["input_size"] != input_stat.st_size
+            or checkpoint.get("input_mtime_ns") != input_stat.st_mtime_ns
+            or checkpoint["start_positions"] != self.start_positions
+        ):
+            raise ValueError(
+                f"Checkpoint {self.checkpoint_path} is from a different job; "
+                "remove it to start again."
+            )
+        if not os.path.exists(self.output_path):
+            raise ValueError(
+                f"Checkpoint {self.checkpoint_path} has no output file; "
+                "remove it to start again."
+            )
+        if os.path.getsize(self.output_path) < checkpoint["offset"]:
+            raise ValueError(
+                f"Output {self.output_path} is shorter than its checkpoint; "
+                "remove the checkpoint to start again."
+            )
+
+        return checkpoint
+
+    def write_checkpoint(self, offset, input_stat):
+        """Atomically write a checkpoint.
+
+        The checkpoint is written to a temporary file, synced, then renamed
+        over the previous checkpoint, so a crash leaves either the old or the
+        new checkpoint intact.
+        :param offset: bytes of input encrypted and synced to the output
+        :type offset: int
+        :param input_stat: status of the input file when the job started
+        :type input_stat: os.stat_result
+        """
+        checkpoint = {
+            "offset": offset,
+            "rotor1": self.enigma.rotor1.position,
+            "rotor2": self.enigma.rotor2.position,
+            "rotor3": self.enigma.rotor3.position,
+            "output_length": offset,
+            "input_size": input_stat.st_size,
+            "input_mtime_ns": input_stat.st_mtime_ns,
+            "start_positions": self.start_positions,
+        }
+
+        temp_path = self.checkpoint_path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump(checkpoint, f)
+            self.sync(f)
+        os.replace(temp_path, self.checkpoint_path)
+
+        # Sync the directory too, so the rename itself is durable
+        if hasattr(os, "O_DIRECTORY"):
+            dir_fd = os.open(
+                os.path.dirname(os.path.abspath(self.checkpoint_path)),
+                os.O_RDONLY | os.O_DIRECTORY,
+            )
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+
+    @staticmethod
+    def sync(f):
+        """Flush a file and sync it to disk.
+
+        :param f: open file
+        :type f: io.IOBase
+        """
+        f.flush()
+        os.fsync(f.fileno())
@@ -4,20 +4,241 @@ A Morse "key" is a device with a button used to encode the carrier wave with a
 Morse signal. Morse operators use these to produce the familiar "dits" and
 "dahs" of Morse code. The Keyer class converts dots and dashes into an encoded
 carrier waveform and plays it audibly.
+
+Text can also be keyed directly with text_to_signal(), which skips the
+intermediate dot-and-dash string, and signals_to_text() decodes binary signals
+back to text.
 """
 import numpy as np
-import simpleaudio as sa
+
+from enigma.morse import MORSE_CODE
 
 # Dit and dah timings
 MORSE_DIT_FREQ = 10  # dits per second
 MORSE_DIT = 1
 MORSE_DAH = 3
 
+# Gaps (in dits) between elements of a character, characters and words
+MORSE_ELEMENT_GAP = 1
+MORSE_CHAR_GAP = 3
+MORSE_WORD_GAP = 7
+
+# Thresholds (in dits) for classifying received runs: on-runs at least
+# DAH_MIN long are dahs, and off-runs at least CHAR_GAP_MIN or WORD_GAP_MIN
+# long end a character or word
+DAH_MIN = 2
+CHAR_GAP_MIN = 2
+WORD_GAP_MIN = 5
+
+# Decoded character for Morse code that doesn't match any character
+UNKNOWN_CHAR = "?"
+
 # Audio settings
 FREQUENCY = 440  # 440 Hz
 SAMPLE_RATE = 44100
 
 
+def create_segment(code):
+    """Create the binary signal for a single Morse character.
+
+    Elements are separated by one dit of silence; there is no trailing gap.
+    For example, ".-" becomes [1, 0, 1, 1, 1]
+    :param code: dot-and-dash Morse code for one character
+    :type code: str
+    :return: binary signal of the character
+    :rtype: np.ndarray
+    """
+    element_lengths = {".": MORSE_DIT, "-": MORSE_DAH}
+    segment = []
+    for i, element in enumerate(code):
+        if i > 0:
+            segment += MORSE_ELEMENT_GAP * [0]
+        segment += element_lengths[element] * [1]
+
+    return np.array(segment, dtype=np.int8)
+
+
+# Precomputed on/off segment for each character
+MORSE_SEGMENTS = {
+    char: create_segment(code) for char, code in MORSE_CODE.items()
+}
+CHAR_GAP_SEGMENT = np.zeros(MORSE_CHAR_GAP, dtype=np.int8)
+WORD_GAP_SEGMENT = np.zeros(MORSE_WORD_GAP, dtype=np.int8)
+
+
+def morse_number(code):
+    """Number a Morse code as binary, dits 0 and dahs 1, after a leading 1.
+
+    The leading 1 tells codes of different lengths apart, e.g. ".-" is 0b101
+    and "..-" is 0b1001.
+    :param code: dot-and-dash Morse code for one character
+    :type code: str
+    :return: number of the code
+    :rtype: int
+    """
+    number = 1
+    for element in code:
+        number = 2 * number + (element == "-")
+    return number
+
+
+# Most elements in a character
+MORSE_MAX_ELEMENTS = max(len(code) for code in MORSE_CODE.values())
+
+
+def create_morse_table():
+    """Create a lookup table of characters indexed by Morse number.
+
+    :return: character of each Morse number, or UNKNOWN_CHAR
+    :rtype: np.ndarray
+    """
+    table = np.full(2 ** (MORSE_MAX_ELEMENTS + 1), UNKNOWN_CHAR)
+    for char, code in MORSE_CODE.items():
+        table[morse_number(code)] = char
+
+    return table
+
+
+MORSE_TABLE = create_morse_table()
+
+
+def text_to_signal(text):
+    """Convert text straight to a binary Morse signal.
+
+    Each character's precomputed segment is joined with the correct
+    character and word gaps in a single concatenation. For example, "E T"
+    becomes [1, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1]
+    :param text: text to convert; words are separated by whitespace
+    :type text: str
+    :return: binary Morse code signal
+    :rtype: np.ndarray
+    """
+    segments = []
+    for word in text.upper().split():
+        if segments:
+            segments.append(WORD_GAP_SEGMENT)
+
+        for i, char in enumerate(word):
+            if i > 0:
+                segments.append(CHAR_GAP_SEGMENT)
+            segments.append(MORSE_SEGMENTS[char])
+
+    if not segments:
+        return np.zeros(0, dtype=np.int8)
+
+    return np.concatenate(segments)
+
+
+def signals_to_text(signals, samples_per_dit=1):
+    """Decode binary Morse signals to text.
+
+    All signals are decoded together. The on and off runs of the signals are
+    found from where they change, on-runs are classified as dits or dahs and
+    off-runs as gaps between elements, characters or words. Each character's
+    elements are then summed into its Morse number and looked up in
+    MORSE_TABLE.
+    :param signals: binary Morse code signals
+    :type signals: list
+    :param samples_per_dit: samples of each signal per dit
+    :type samples_per_dit: float
+    :return: text of each signal, with a space between words
+    :rtype: list
+    """
+    if not len(signals):
+        return []
+
+    # Pad each signal with an off sample either side, so runs never cross
+    # from one signal to the next
+    lengths = np.array([len(signal) for signal in signals]) + 2
+    signal_starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    padded = np.zeros(lengths.sum(), dtype=np.int8)
+    for signal, start in zip(signals, signal_starts):
+        padded[start + 1:start + 1 + len(signal)] = np.asarray(signal) != 0
+
+    changes = np.diff(padded)
+    run_starts = np.flatnonzero(changes == 1)
+    run_ends = np.flatnonzero(changes == -1)
+    signal_ids = np.searchsorted(signal_starts, run_starts, side="right") - 1
+    if not run_starts.size:
+        return [""] * len(signals)
+
+    # Classify element and gap lengths in dits
+    is_dah = (run_ends - run_starts) / samples_per_dit >= DAH_MIN
+    gaps = (run_starts[1:] - run_ends[:-1]) / samples_per_dit
+    new_signal = signal_ids[1:] != signal_ids[:-1]
+    new_char = np.concatenate(([True], (gaps >= CHAR_GAP_MIN) | new_signal))
+    new_word = np.concatenate(([False], (gaps >= WORD_GAP_MIN) & ~new_signal))
+
+    # Number each character's elements from the last (0) to the first, and
+    # add up the dahs as binary digits of its Morse number
+    char_starts = np.flatnonzero(new_char)
+    char_lengths = np.diff(np.append(char_starts, is_dah.size))
+    char_ids = np.cumsum(new_char) - 1
+    element_nums = np.arange(is_dah.size) - char_starts[char_ids]
+    digits = np.minimum(char_lengths[char_ids] - 1 - element_nums, 62)
+    numbers = np.add.reduceat(is_dah.astype(np.int64) << digits, char_starts)
+    numbers += np.int64(1) << np.minimum(char_lengths, 62)
+    numbers[char_lengths > MORSE_MAX_ELEMENTS] = 0
+    chars = MORSE_TABLE[numbers]
+
+    # Put a space before each character that starts a new word
+    spaces = new_word[char_starts]
+    out_positions = np.arange(chars.size) + np.cumsum(spaces)
+    out = np.full(chars.size + spaces.sum(), " ")
+    out[out_positions] = chars
+    text = "".join(out.tolist())
+
+    # Split the text back up by signal
+    char_signal_ids = signal_ids[char_starts]
+    out_counts = np.bincount(
+        char_signal_ids, weights=1 + spaces, minlength=len(signals)
+    ).astype(np.int64)
+    out_bounds = np.concatenate(([0], np.cumsum(out_counts)))
+    return [
+        text[start:end] for start, end in zip(out_bounds[:-1], out_bounds[1:])
+    ]
+
+
+def signal_to_text(signal, samples_per_dit=1):
+    """Decode a binary Morse signal to text.
+
+    For example, [1, 0, 0, 0, 1, 1, 1] becomes "ET"
+    :param signal: binary Morse code signal
+    :type signal: np.ndarray
+    :param samples_per_dit: samples of the signal per dit
+    :type samples_per_dit: float
+    :return: text, with a space between words
+    :rtype: str
+    """
+    return signals_to_text([signal], samples_per_dit)[0]
+
+
+def modulate(signal, start=0, frequency=FREQUENCY, dit_freq=MORSE_DIT_FREQ):
+    """Key a sine carrier with a binary signal.
+
+    The carrier phase continues from sample number start, so consecutive
+    signals can be modulated separately and joined without clicks.
+    :param signal: binary Morse code signal
+    :type signal: np.ndarray
+    :param start: sample number of the start of the signal
+    :type start: int
+    :param frequency: carrier frequency in Hz
+    :type frequency: float
+    :param dit_freq: dits per second
+    :type dit_freq: float
+    :return: keyed carrier, in the range -1 to 1
+    :rtype: np.ndarray
+    """
+    samples_per_dit = int(round(SAMPLE_RATE / dit_freq))
+    keyed = np.repeat(signal, samples_per_dit)
+
+    # Phase as a fraction of a cycle; reduce the sample numbers modulo the
+    # sample rate first so long streams don't lose precision
+    sample_nums = np.arange(start, start + keyed.size, dtype=np.int64)
+    cycles = (sample_nums * frequency % SAMPLE_RATE) / SAMPLE_RATE
+    return np.sin(2 * np.pi * cycles) * keyed
+
+
 class Keyer:
     """Convert Morse code to audio and play it."""
 
@@ -30,6 +251,20 @@ class Keyer:
         self.signal = self.create_binary_signal(morse)
         self.audio = self.convert_audio()
 
+    @classmethod
+    def from_text(cls, text):
+        """Key text directly, without an intermediate Morse string.
+
+        :param text: text to convert to audio
+        :type text: str
+        :return: Keyer for the text
+        :rtype: enigma.keyer.Keyer
+        """
+        keyer = cls.__new__(cls)
+        keyer.signal = text_to_signal(text)
+        keyer.audio = keyer.convert_audio()
+        return keyer
+
     def create_binary_signal(self, morse):
         """Converts Morse code into a binary signal.
 
@@ -52,7 +287,8 @@ class Keyer:
             signal_list += MORSE_DIT * [0]
 
         # TODO Correct number of spaces: consider end of char/word following
-        # dit/dah: has one too many spaces currently
+        # dit/dah: has one too many spaces currently. text_to_signal() has
+        # the correct gaps
 
         # signal_list is now list of binary digits, each representing a dit
         # duration of on or off
@@ -92,9 +328,17 @@ class Keyer:
     def play(self):
         """Play Morse code.
 
-        In the case of audio errors (i.e. on CI system with no sound card),
-        catch exception and notify.
+        In the case of audio errors (i.e. on CI system with no sound card, or
+        without simpleaudio installed), catch exception and notify.
+        simpleaudio is only imported here, so the rest of the keyer can be
+        used without an audio backend installed.
         """
+        try:
+            import simpleaudio as sa
+        except ModuleNotFoundError:
+            print("There was an error with audio playback.")
+            return
+
         try:
             # Start playback
             play_obj = sa.play_buffer(self.audio, 1, 2, SAMPLE_RATE)
@@ -0,0 +1,200 @@
+"""Mix many Morse transmissions into one audio stream.
+
+Each channel keys its own message on its own carrier frequency, at its own
+speed, starting at its own time. The channels are synthesised a chunk at a
+time, all samples of a channel in a chunk at once, and summed. The mix is
+scaled by the total amplitude of the channels so it can never clip. Only the
+chunk being rendered is held in memory, so hours of audio with dozens of
+channels can be generated in bounded memory.
+
+This is intended for load testing Morse receivers.
+"""
+import random
+from math import gcd
+from string import ascii_uppercase as ALPHABET
+
+import numpy as np
+
+from enigma.keyer import MORSE_DIT_FREQ, SAMPLE_RATE, text_to_signal
+from enigma.transmit import AMPLITUDE
+
+# Samples rendered at a time
+CHUNK_SIZE = SAMPLE_RATE
+
+# One cycle of the carrier, sampled once per 1 / SAMPLE_RATE of a cycle. With
+# whole-number frequencies, the carrier at sample n is
+# SINE_TABLE[n * frequency % SAMPLE_RATE]
+SINE_TABLE = np.sin(2 * np.pi * np.arange(SAMPLE_RATE) / SAMPLE_RATE)
+
+# Range of carrier frequencies (Hz) and speeds (dits per second) of random
+# channels
+RANDOM_FREQ_RANGE = (300, 3300)
+RANDOM_DIT_FREQ_RANGE = (5, 20)
+
+
+class Channel:
+    """A single Morse transmission within the mix."""
+
+    def __init__(
+        self, text, frequency, dit_freq=MORSE_DIT_FREQ, offset=0, amplitude=1
+    ):
+        """Key the channel's message.
+
+        :param text: message to transmit
+        :type text: str
+        :param frequency: carrier frequency in Hz, rounded to a whole number
+        :type frequency: float
+        :param dit_freq: dits per second
+        :type dit_freq: float
+        :param offset: start time of the transmission in seconds
+        :type offset: float
+        :param amplitude: relative amplitude of the channel in the mix
+        :type amplitude: float
+        """
+        self.signal = text_to_signal(text)
+        self.frequency = int(round(frequency))
+        self.samples_per_dit = int(round(SAMPLE_RATE / dit_freq))
+        self.amplitude = amplitude
+
+        # Start and end of the transmission, in samples
+        self.start = int(round(offset * SAMPLE_RATE))
+        self.end = self.start + self.signal.size * self.samples_per_dit
+
+        # The carrier repeats every period samples; its samples are built
+        # when first rendered, long enough to slice out any chunk
+        self.period = SAMPLE_RATE // gcd(self.frequency, SAMPLE_RATE)
+        self.carrier = np.zeros(0, dtype=np.float32)
+
+    def carrier_samples(self, first, length):
+        """Samples of the carrier, scaled by the channel amplitude.
+
+        :param first: sample number relative to the start of the transmission
+        :type first: int
+        :param length: number of samples
+        :type length: int
+        :return: carrier samples
+        :rtype: np.ndarray
+        """
+        phase = first % self.period
+        if phase + length > self.carrier.size:
+            sample_nums = np.arange(self.period + length, dtype=np.int64)
+            self.carrier = self.amplitude * SINE_TABLE[
+                sample_nums * self.frequency % SAMPLE_RATE
+            ].astype(np.float32)
+
+        return self.carrier[phase:phase + length]
+
+    def render(self, start, out):
+        """Add the channel's audio to part of the mix.
+
+        :param start: sample number of the start of out
+        :type start: int
+        :param out: mix to add to
+        :type out: np.ndarray
+        """
+        first = max(start, self.start)
+        last = min(start + out.size, self.end)
+        if first >= last:
+            # Channel isn't transmitting in this part of the mix
+            return
+
+        # Stretch the dits covering this part to samples, as in modulate()
+        rel_first = first - self.start
+        length = last - first
+        first_dit = rel_first // self.samples_per_dit
+        last_dit = -(-(rel_first + length) // self.samples_per_dit)
+        keyed = np.repeat(
+            self.signal[first_dit:last_dit], self.samples_per_dit
+        )
+        skip = rel_first - first_dit * self.samples_per_dit
+        keyed = keyed[skip:skip + length]
+
+        out[first - start:last - start] += (
+            keyed * self.carrier_samples(rel_first, length)
+        )
+
+
+class Mixer:
+    """Mix Morse channels into a single 16-bit audio stream."""
+
+    def __init__(self, channels):
+        """Set up the mix.
+
+        :param channels: channels to mix
+        :type channels: list
+        """
+        self.channels = channels
+        self.length = max((channel.end for channel in channels), default=0)
+
+        # Scale so that even if all channels peak together, the mix can't clip
+        total_amplitude = sum(abs(channel.amplitude) for channel in channels)
+        self.scale = AMPLITUDE / total_amplitude if total_amplitude else 0
+
+    def render(self, start, length):
+        """Render part of the mix.
+
+        :param start: sample number of the start of the part
+        :type start: int
+        :param length: number of samples
+        :type length: int
+        :return: 16-bit audio
+        :rtype: np.ndarray
+        """
+        mix = np.zeros(length, dtype=np.float32)
+        for channel in self.channels:
+            channel.render(start, mix)
+
+        mix *= self.scale
+        return mix.astype(np.int16)
+
+    def stream(self, chunk_size=CHUNK_SIZE):
+        """Render the whole mix, a chunk at a time.
+
+        :param chunk_size: samples per chunk
+        :type chunk_size: int
+        :return: 16-bit audio chunks
+        :rtype: generator
+        """
+        for start in range(0, self.length, chunk_size):
+            yield self.render(start, min(chunk_size, self.length - start))
+
+
+def random_channels(count, duration, seed=None):
+    """Create channels of random five-letter groups.
+
+    Carrier frequencies are spread evenly across RANDOM_FREQ_RANGE. Speeds and
+    start offsets are random, and each message is long enough to last until
+    about duration seconds into the mix.
+    :param count: number of channels
+    :type count: int
+    :param duration: approximate length of the mix in seconds
+    :type duration: float
+    :param seed: random seed, for repeatable mixes
+    :type seed: int, optional
+    :raises ValueError: if count is less than 1
+    :return: channels
+    :rtype: list
+    """
+    if count < 1:
+        raise ValueError("There must be at least one channel.")
+
+    rng = random.Random(seed)
+    low, high = RANDOM_FREQ_RANGE
+    spacing = (high - low) / count
+
+    channels = []
+    for i in range(count):
+        dit_freq = rng.uniform(*RANDOM_DIT_FREQ_RANGE)
+        offset = rng.uniform(0, min(duration / 10, 10))
+
+        # A group of 5 letters averages roughly 60 dits including gaps
+        group_count = max(1, int((duration - offset) * dit_freq / 60))
+        text = " ".join(
+            "".join(rng.choice(ALPHABET) for _ in range(5))
+            for _ in range(group_count)
+        )
+        channels.append(
+            Channel(text, low + (i + 0.5) * spacing, dit_freq, offset)
+        )
+
+    return channels
@@ -5,8 +5,10 @@ whereas a space is an absensce of signal. A dit is one unit of Morse time (or
 beat) a dah is three. Each dit or dah is followed by a space of one dit. Each
 character is followed by a space of three dits, and words are separated by a
 space of seven dits.
+
+The text codec only needs the standard library; the keyer (and with it NumPy
+and simpleaudio) is only imported when Morse code is played.
 """
-from enigma.keyer import Keyer
 
 MORSE_CODE = {
     "A": ".-",
@@ -87,6 +89,8 @@ class Morse:
         print(f"Morse: {self.morse}")
 
         # Play Morse code sound
+        from enigma.keyer import Keyer
+
         keyer = Keyer(self.morse)
         keyer.play()
 
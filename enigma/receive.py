@@ -0,0 +1,281 @@
+"""Receive keyed Morse audio and decrypt it with the Enigma machine.
+
+The mirror of the transmit pipeline: a WAV recording is read in chunks, the
+carrier tone is detected in short windows, the on/off runs of the tone are
+classified into Morse symbols, the symbols are decoded into ciphertext letters
+and the letters are decrypted. Every stage is a generator that only holds the
+current chunk, so recordings of any length are processed in bounded memory.
+"""
+from string import ascii_uppercase as ALPHABET
+
+import numpy as np
+
+from enigma.keyer import (
+    CHAR_GAP_MIN,
+    DAH_MIN,
+    FREQUENCY,
+    MORSE_DIT_FREQ,
+    MORSE_MAX_ELEMENTS,
+    MORSE_TABLE,
+    SAMPLE_RATE,
+    UNKNOWN_CHAR,
+    WORD_GAP_MIN,
+)
+from enigma.transmit import threaded
+
+# Seconds of audio read at a time
+CHUNK_SECONDS = 1
+
+# Tone detection windows per dit
+WINDOWS_PER_DIT = 10
+
+# The tone is on when its amplitude is above this fraction of the loudest
+# tone heard so far
+THRESHOLD = 0.5
+
+# Quietest amplitude (as a fraction of full scale) treated as a tone, so that
+# silence at the start of a recording isn't mistaken for one
+TONE_FLOOR = 0.05
+
+# Full scale of 16-bit audio
+FULL_SCALE = 2 ** 15
+
+# Symbols marking the end of a character and of a word
+CHAR_END = " "
+WORD_END = "/"
+
+
+def window_size(sample_rate=SAMPLE_RATE, dit_freq=MORSE_DIT_FREQ):
+    """Number of samples in a tone detection window.
+
+    :param sample_rate: samples per second
+    :type sample_rate: int
+    :param dit_freq: dits per second
+    :type dit_freq: float
+    :return: samples per window
+    :rtype: int
+    """
+    return max(1, int(round(sample_rate / dit_freq / WINDOWS_PER_DIT)))
+
+
+def read_wav(wav_file, chunk_frames=None):
+    """Read 16-bit audio from a WAV file in chunks.
+
+    Only the first channel of multi-channel audio is used.
+    :param wav_file: open WAV file
+    :type wav_file: wave.Wave_read
+    :param chunk_frames: frames per chunk; defaults to CHUNK_SECONDS of audio
+    :type chunk_frames: int, optional
+    :raises ValueError: if the audio isn't 16-bit
+    :return: 16-bit audio chunks
+    :rtype: generator
+    """
+    if wav_file.getsampwidth() != 2:
+        raise ValueError("Only 16-bit WAV files are supported.")
+
+    if chunk_frames is None:
+        chunk_frames = CHUNK_SECONDS * wav_file.getframerate()
+    channels = wav_file.getnchannels()
+
+    while True:
+        frames = wav_file.readframes(chunk_frames)
+        if not frames:
+            return
+        yield np.frombuffer(frames, dtype="<i2")[::channels]
+
+
+def detect_tone(
+    audio_chunks,
+    sample_rate=SAMPLE_RATE,
+    frequency=FREQUENCY,
+    dit_freq=MORSE_DIT_FREQ,
+):
+    """Detect the carrier tone in short windows of audio.
+
+    The amplitude of the carrier frequency in each window is found by
+    correlating the window with a sine and cosine at that frequency, for all
+    windows in a chunk at once.
+    :param audio_chunks: 16-bit audio chunks
+    :type audio_chunks: iterable
+    :param sample_rate: samples per second
+    :type sample_rate: int
+    :param frequency: carrier frequency in Hz
+    :type frequency: float
+    :param dit_freq: dits per second
+    :type dit_freq: float
+    :return: whether the tone is on in each window, per chunk
+    :rtype: generator
+    """
+    window = window_size(sample_rate, dit_freq)
+    phase = 2 * np.pi * frequency * np.arange(window) / sample_rate
+    reference = np.stack((np.cos(phase), np.sin(phase)), axis=1)
+
+    peak = TONE_FLOOR
+    leftover = np.zeros(0, dtype=np.int16)
+    for chunk in audio_chunks:
+        # Carry samples that don't fill a window over to the next chunk
+        samples = np.concatenate((leftover, chunk))
+        window_count = samples.size // window
+        leftover = samples[window_count * window:]
+        windows = samples[:window_count * window].reshape(window_count, window)
+
+        components = windows @ reference
+        amplitude = np.hypot(components[:, 0], components[:, 1])
+        amplitude *= 2 / (window * FULL_SCALE)
+
+        if amplitude.size:
+            peak = max(peak, amplitude.max())
+        yield amplitude > THRESHOLD * peak
+
+
+def signal_runs(keyed_chunks):
+    """Run-length encode the keyed state of the tone.
+
+    Runs that continue from one chunk into the next are joined.
+    :param keyed_chunks: whether the tone is on in each window, per chunk
+    :type keyed_chunks: iterable
+    :return: (tone on, length in windows) for each run
+    :rtype: generator
+    """
+    state = None
+    length = 0
+    for keyed in keyed_chunks:
+        if not keyed.size:
+            continue
+
+        # Indices at which each run starts, and the end of the chunk
+        bounds = np.concatenate(
+            ([0], np.flatnonzero(keyed[1:] != keyed[:-1]) + 1, [keyed.size])
+        )
+        run_states = keyed[bounds[:-1]].tolist()
+        run_lengths = np.diff(bounds).tolist()
+
+        for run_state, run_length in zip(run_states, run_lengths):
+            if run_state == state:
+                length += run_length
+            else:
+                if state is not None:
+                    yield state, length
+                state, length = run_state, run_length
+
+    if state is not None:
+        yield state, length
+
+
+def runs_to_symbols(runs, windows_per_dit=WINDOWS_PER_DIT):
+    """Classify tone runs into Morse symbols.
+
+    Tone runs are dits or dahs. Silent runs are gaps between elements (which
+    have no symbol), or the end of a character or word. Silence before the
+    first tone is ignored.
+    :param runs: (tone on, length in windows) for each run
+    :type runs: iterable
+    :param windows_per_dit: detection windows per dit
+    :type windows_per_dit: float
+    :return: ".", "-", CHAR_END or WORD_END
+    :rtype: generator
+    """
+    started = False
+    for tone_on, length in runs:
+        dits = length / windows_per_dit
+        if tone_on:
+            started = True
+            yield "." if dits < DAH_MIN else "-"
+        elif started:
+            if dits >= WORD_GAP_MIN:
+                yield WORD_END
+            elif dits >= CHAR_GAP_MIN:
+                yield CHAR_END
+
+
+def decode_symbols(symbols):
+    """Decode Morse symbols into characters.
+
+    Each character's elements are numbered as by morse_number() and looked up
+    in MORSE_TABLE.
+    :param symbols: ".", "-", CHAR_END or WORD_END
+    :type symbols: iterable
+    :return: characters, with a space after each word
+    :rtype: generator
+    """
+    number = 1
+    elements = 0
+    for symbol in symbols:
+        if symbol == CHAR_END or symbol == WORD_END:
+            if elements:
+                yield decode_number(number, elements)
+                number = 1
+                elements = 0
+            if symbol == WORD_END:
+                yield " "
+        else:
+            number = 2 * number + (symbol == "-")
+            elements += 1
+
+    if elements:
+        yield decode_number(number, elements)
+
+
+def decode_number(number, elements):
+    """Look up the character of a Morse number.
+
+    :param number: Morse number of the character's elements
+    :type number: int
+    :param elements: number of elements in the character
+    :type elements: int
+    :return: character, or UNKNOWN_CHAR
+    :rtype: str
+    """
+    if elements > MORSE_MAX_ELEMENTS:
+        return UNKNOWN_CHAR
+    return str(MORSE_TABLE[number])
+
+
+def decrypt_letters(enigma, letters):
+    """Decrypt ciphertext letters.
+
+    Spaces between groups are dropped. Characters that aren't letters could
+    not have been sent by the machine; the rotors are still stepped so that
+    the rest of the message decrypts.
+    :param enigma: the machine to decrypt with, at its start state
+    :type enigma: enigma.enigma.Enigma
+    :param letters: ciphertext letters
+    :type letters: iterable
+    :return: plaintext letters
+    :rtype: generator
+    """
+    for letter in letters:
+        if letter == " ":
+            continue
+
+        if letter in ALPHABET:
+            yield enigma.find_key(letter)
+        else:
+            enigma.step_rotors()
+            yield UNKNOWN_CHAR
+
+
+def receive(enigma, wav_file, frequency=FREQUENCY, dit_freq=MORSE_DIT_FREQ):
+    """Build the pipeline from a WAV recording to plaintext.
+
+    Reading and tone detection run in their own thread.
+    :param enigma: the machine to decrypt with, at its start state
+    :type enigma: enigma.enigma.Enigma
+    :param wav_file: open WAV file
+    :type wav_file: wave.Wave_read
+    :param frequency: carrier frequency in Hz
+    :type frequency: float
+    :param dit_freq: dits per second
+    :type dit_freq: float
+    :return: plaintext letters
+    :rtype: generator
+    """
+    sample_rate = wav_file.getframerate()
+    window = window_size(sample_rate, dit_freq)
+    windows_per_dit = sample_rate / dit_freq / window
+
+    keyed_chunks = threaded(
+        detect_tone(read_wav(wav_file), sample_rate, frequency, dit_freq)
+    )
+    symbols = runs_to_symbols(signal_runs(keyed_chunks), windows_per_dit)
+    return decrypt_letters(enigma, decode_symbols(symbols))
@@ -0,0 +1,190 @@
+"""Replay recorded keystrokes through an Enigma machine.
+
+A keystroke log has one key per line, optionally preceded by the time in
+seconds since the start of the recording, e.g. "0.250 A". Keys without a
+character are logged by name, e.g. "shift" or "esc". Replaying a log drives
+the same key handler as the interactive keyboard listener, but writes its
+output through a buffer and records the key-to-bulb latency of every key. As
+when listening, named keys are ignored, except esc, which ends the replay.
+"""
+import sys
+import time
+from bisect import bisect_left
+
+# Upper bounds (in microseconds) of the latency histogram buckets; a final
+# bucket holds anything slower
+LATENCY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+# Number of output lines to buffer before writing
+FLUSH_LINES = 4096
+
+# Name of the key that ends the replay, as it ends the keyboard listener
+ESCAPE_KEY = "esc"
+
+
+def light_bulb(enigma, key_char):
+    """Press a key and describe the bulb that lights up.
+
+    :param enigma: the machine to press the key on
+    :type enigma: enigma.enigma.Enigma
+    :param key_char: character of the key pressed
+    :type key_char: str
+    :return: output line, e.g. "A --> F"
+    :rtype: str
+    """
+    key_pressed = key_char.upper()
+    bulb_lit = enigma.press_key(key_pressed)
+    return f"{key_pressed} --> {bulb_lit}"
+
+
+def read_log(log_file):
+    """Read keystrokes from a keystroke log.
+
+    :param log_file: open keystroke log
+    :type log_file: io.TextIOBase
+    :raises ValueError: if a line isn't "[seconds] key"
+    :return: (time in seconds or None, key) for each keystroke
+    :rtype: generator
+    """
+    for line_number, line in enumerate(log_file, 1):
+        fields = line.split()
+        if not fields:
+            continue
+
+        if len(fields) > 2:
+            raise ValueError(
+                f"Line {line_number} of the keystroke log has more than two "
+                f"fields: {line.strip()!r}"
+            )
+
+        if len(fields) == 1:
+            # A single digit is a key, but a longer number is a time
+            if len(fields[0]) > 1 and is_number(fields[0]):
+                raise ValueError(
+                    f"Line {line_number} of the keystroke log has a time but "
+                    f"no key: {line.strip()!r}"
+                )
+            yield None, fields[0]
+        else:
+            if not is_number(fields[0]):
+                raise ValueError(
+                    f"Line {line_number} of the keystroke log has an invalid "
+                    f"time: {line.strip()!r}"
+                )
+            yield float(fields[0]), fields[1]
+
+
+def is_number(field):
+    """Whether a log field is a number.
+
+    :param field: field of a keystroke log line
+    :type field: str
+    :return: True if the field is a number
+    :rtype: bool
+    """
+    try:
+        float(field)
+    except ValueError:
+        return False
+    return True
+
+
+def replay(enigma, keystrokes, out=None, timing=False):
+    """Replay keystrokes through the machine.
+
+    Keys are single characters; longer keys are named keys without a
+    character, which are ignored, except ESCAPE_KEY, which ends the replay.
+    :param enigma: the machine to press the keys on
+    :type enigma: enigma.enigma.Enigma
+    :param keystrokes: (time in seconds or None, key) for each keystroke
+    :type keystrokes: iterable
+    :param out: stream to write the output lines to; defaults to stdout
+    :type out: io.TextIOBase
+    :param timing: if True, wait until each keystroke's recorded time
+    :type timing: bool
+    :return: latency of each key press in seconds
+    :rtype: list
+    """
+    if out is None:
+        out = sys.stdout
+
+    latencies = []
+    lines = []
+    start = time.perf_counter()
+
+    for key_time, key_char in keystrokes:
+        if len(key_char) > 1:
+            # Named key, e.g. shift; the listener only stops on esc
+            if key_char.lower() == ESCAPE_KEY:
+                break
+            continue
+
+        if timing and key_time is not None:
+            # Key arrives at its recorded time; if we are running behind,
+            # the extra wait counts towards its latency. If we are early,
+            # wait for it, but don't count any oversleep as latency
+            key_arrival = start + key_time
+            delay = key_arrival - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+                key_arrival = time.perf_counter()
+        else:
+            key_arrival = time.perf_counter()
+
+        lines.append(light_bulb(enigma, key_char))
+        latencies.append(time.perf_counter() - key_arrival)
+
+        if len(lines) >= FLUSH_LINES:
+            out.write("\n".join(lines) + "\n")
+            lines = []
+
+    if lines:
+        out.write("\n".join(lines) + "\n")
+    out.flush()
+
+    return latencies
+
+
+def latency_histogram(latencies):
+    """Count latencies into histogram buckets.
+
+    :param latencies: latency of each key press in seconds
+    :type latencies: list
+    :return: count for each bucket in LATENCY_BUCKETS, plus one for slower
+    :rtype: list
+    """
+    counts = [0] * (len(LATENCY_BUCKETS) + 1)
+    for latency in latencies:
+        counts[bisect_left(LATENCY_BUCKETS, latency * 1e6)] += 1
+
+    return counts
+
+
+def format_report(latencies):
+    """Summarise key-to-bulb latencies.
+
+    :param latencies: latency of each key press in seconds
+    :type latencies: list
+    :return: multi-line latency report
+    :rtype: str
+    """
+    if not latencies:
+        return "No keys pressed."
+
+    ordered = sorted(latencies)
+    p50 = ordered[len(ordered) // 2] * 1e6
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1e6
+    report = [
+        f"Keys: {len(ordered)}",
+        f"Latency (us): p50 {p50:.1f}, p99 {p99:.1f}, "
+        f"max {ordered[-1] * 1e6:.1f}",
+    ]
+
+    counts = latency_histogram(ordered)
+    lower = 0
+    for upper, count in zip(LATENCY_BUCKETS, counts):
+        report.append(f"{lower:>6}-{upper:<6} us: {count}")
+        lower = upper
+    report.append(f"{lower:>6}+       us: {counts[-1]}")
+
+    return "\n".join(report)
@@ -0,0 +1,223 @@
+"""Statistics of Enigma ciphertext.
+
+Letter frequencies, the index of coincidence and autocorrelation are the usual
+first look at a ciphertext. CiphertextStats accumulates them a block of bytes
+at a time, so file_stats() can memory-map a file of any size and stream it
+through in constant memory.
+
+Letters are also counted in buckets by their position in the machine's
+stepping cycle: with a period of 26, letters enciphered at the same rotor 1
+position share a bucket, so structure tied to the rotor positions shows up
+as differences between the buckets.
+"""
+import mmap
+
+import numpy as np
+
+from enigma.enigma import ROTOR_LEN
+
+# Bytes processed at a time
+BLOCK_SIZE = 4 * 1024 * 1024
+
+# Default lags for autocorrelation
+DEFAULT_LAGS = (1, 2, 3, ROTOR_LEN)
+
+
+class CiphertextStats:
+    """Accumulate statistics of a ciphertext, a block at a time."""
+
+    def __init__(self, lags=DEFAULT_LAGS, period=ROTOR_LEN):
+        """Start with no letters counted.
+
+        :param lags: lags (in letters) to autocorrelate at
+        :type lags: iterable
+        :param period: length of the stepping cycle to bucket letters by
+        :type period: int
+        :raises ValueError: if a lag or the period isn't positive
+        """
+        self.lags = sorted(set(lags))
+        if period < 1 or (self.lags and self.lags[0] < 1):
+            raise ValueError("Lags and period must be positive.")
+        self.period = period
+
+        self.total = 0
+        self.period_counts = np.zeros((period, ROTOR_LEN), dtype=np.int64)
+        self.matches = dict.fromkeys(self.lags, 0)
+        self.pairs = dict.fromkeys(self.lags, 0)
+
+        # Last letters of the previous block, to pair with the next block
+        self.tail = np.zeros(0, dtype=np.uint8)
+
+        # Bucket of each letter, times the number of letters, repeating with
+        # the period; built for the largest block seen so far
+        if period * ROTOR_LEN <= 2 ** 16:
+            self.key_dtype = np.uint16
+        else:
+            self.key_dtype = np.intp
+        self.bucket_offsets = np.zeros(0, dtype=self.key_dtype)
+
+    @property
+    def counts(self):
+        """Count of each letter.
+
+        :return: counts of A to Z
+        :rtype: np.ndarray
+        """
+        return self.period_counts.sum(axis=0)
+
+    def update(self, block):
+        """Count the letters in a block of bytes.
+
+        Bytes that aren't letters are skipped; letters are counted regardless
+        of case.
+        :param block: block of ciphertext
+        :type block: np.ndarray
+        """
+        # Fold to lower case and number the letters 0-25. Only ASCII letters
+        # end up in that range; everything else wraps around to 26 or more
+        letters = block | 0x20
+        letters -= ord("a")
+        if letters.size and letters.max() >= ROTOR_LEN:
+            letters = letters[letters < ROTOR_LEN]
+        if not letters.size:
+            return
+
+        # Count letters by bucket and letter together, in one pass
+        phase = self.total % self.period
+        if phase + letters.size > self.bucket_offsets.size:
+            self.bucket_offsets = (
+                np.arange(self.period + letters.size) % self.period
+                * ROTOR_LEN
+            ).astype(self.key_dtype)
+        keys = self.bucket_offsets[phase:phase + letters.size] + letters
+        self.period_counts += np.bincount(
+            keys, minlength=self.period * ROTOR_LEN
+        ).reshape(self.period, ROTOR_LEN)
+
+        # Compare each new letter with the letter lag before it, which may
+        # be in the tail of the previous block
+        sequence = np.concatenate((self.tail, letters))
+        new_start = self.tail.size
+        for lag in self.lags:
+            first = max(new_start, lag)
+            if first >= sequence.size:
+                continue
+            self.matches[lag] += int(
+                np.count_nonzero(
+                    sequence[first:] == sequence[first - lag:-lag]
+                )
+            )
+            self.pairs[lag] += sequence.size - first
+
+        if self.lags:
+            self.tail = sequence[-self.lags[-1]:]
+        self.total += letters.size
+
+    def frequencies(self):
+        """Relative frequency of each letter.
+
+        :return: frequencies of A to Z
+        :rtype: np.ndarray
+        """
+        if not self.total:
+            return np.zeros(ROTOR_LEN)
+        return self.counts / self.total
+
+    def index_of_coincidence(self):
+        """Probability that two letters picked at random are the same.
+
+        About 0.038 for random letters and 0.066 for English.
+        :return: index of coincidence
+        :rtype: float
+        """
+        return index_of_coincidence(self.counts)
+
+    def period_index_of_coincidence(self):
+        """Index of coincidence within each stepping cycle bucket.
+
+        :return: index of coincidence of each bucket
+        :rtype: np.ndarray
+        """
+        return np.array(
+            [index_of_coincidence(counts) for counts in self.period_counts]
+        )
+
+    def autocorrelation(self):
+        """Fraction of letters that match the letter at each lag before.
+
+        :return: autocorrelation at each lag
+        :rtype: dict
+        """
+        return {
+            lag: self.matches[lag] / self.pairs[lag] if self.pairs[lag] else 0
+            for lag in self.lags
+        }
+
+    def report(self):
+        """Summarise the statistics.
+
+        :return: multi-line report
+        :rtype: str
+        """
+        lines = [
+            f"Letters: {self.total}",
+            f"Index of coincidence: {self.index_of_coincidence():.5f}",
+            f"Mean index of coincidence over period {self.period}: "
+            f"{np.mean(self.period_index_of_coincidence()):.5f}",
+            "Frequencies:",
+        ]
+        for letter, frequency in enumerate(self.frequencies()):
+            lines.append(f"  {chr(ord('A') + letter)}: {frequency:.5f}")
+
+        lines.append("Autocorrelation:")
+        for lag, value in self.autocorrelation().items():
+            lines.append(f"  lag {lag}: {value:.5f}")
+
+        return "\n".join(lines)
+
+
+def index_of_coincidence(counts):
+    """Index of coincidence of letter counts.
+
+    :param counts: count of each letter
+    :type counts: np.ndarray
+    :return: index of coincidence, or 0 for fewer than two letters
+    :rtype: float
+    """
+    total = int(counts.sum())
+    if total < 2:
+        return 0.0
+    return float(np.sum(counts * (counts - 1)) / (total * (total - 1)))
+
+
+def file_stats(
+    path, lags=DEFAULT_LAGS, period=ROTOR_LEN, block_size=BLOCK_SIZE
+):
+    """Accumulate statistics of a file, memory-mapped and read in blocks.
+
+    :param path: path of the ciphertext file
+    :type path: str
+    :param lags: lags (in letters) to autocorrelate at
+    :type lags: iterable
+    :param period: length of the stepping cycle to bucket letters by
+    :type period: int
+    :param block_size: bytes processed at a time
+    :type block_size: int
+    :return: statistics of the file
+    :rtype: CiphertextStats
+    """
+    stats = CiphertextStats(lags, period)
+    with open(path, "rb") as f:
+        # Empty files can't be memory-mapped
+        f.seek(0, 2)
+        if not f.tell():
+            return stats
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            data = np.frombuffer(mapped, dtype=np.uint8)
+            for start in range(0, data.size, block_size):
+                stats.update(data[start:start + block_size])
+            # Release the buffer before the map is closed
+            del data
+
+    return stats
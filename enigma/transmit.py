@@ -0,0 +1,295 @@
+"""Stream text through the Enigma machine to keyed Morse audio.
+
+The transmitter is a pipeline of generator stages: text is encrypted, the
+ciphertext letters are keyed into Morse audio one letter at a time, and the
+audio is written to a WAV file or played. Each stage can run in its own
+thread, connected to the next by a bounded queue, so audio starts as soon as
+the first letter is encrypted and memory use doesn't grow with the input.
+
+Ciphertext is sent in groups of letters separated by word gaps, as Enigma
+operators did.
+"""
+import queue
+import threading
+import wave
+from string import ascii_uppercase as ALPHABET
+
+import numpy as np
+
+from enigma.keyer import (
+    CHAR_GAP_SEGMENT,
+    MORSE_SEGMENTS,
+    SAMPLE_RATE,
+    WORD_GAP_SEGMENT,
+    modulate,
+)
+
+# Ciphertext letters per transmitted group
+GROUP_SIZE = 5
+
+# Maximum number of items waiting between pipeline stages
+QUEUE_SIZE = 16
+
+# Number of characters read from the input at a time
+READ_SIZE = 64
+
+# Seconds of audio sent to the audio device at a time
+PLAY_SECONDS = 2
+
+# Amplitude of the keyed carrier in the 16-bit audio
+AMPLITUDE = 2 ** 15 - 1
+
+# Seconds a threaded stage waits to put an item on a full queue before
+# checking whether its consumer has stopped
+PUT_TIMEOUT = 0.1
+
+# Sentinel marking the end of a threaded stage's output
+_DONE = object()
+
+
+class _StageError:
+    """Exception raised in a threaded stage, to be re-raised downstream."""
+
+    def __init__(self, exception):
+        """Store the exception.
+
+        :param exception: exception raised in the stage
+        :type exception: BaseException
+        """
+        self.exception = exception
+
+
+def threaded(stage, queue_size=QUEUE_SIZE):
+    """Run a generator stage in its own thread.
+
+    The stage's output is passed through a bounded queue, so the stage can
+    only get queue_size items ahead of its consumer. If the consumer stops
+    early, the stage is closed and its thread exits.
+    :param stage: generator stage
+    :type stage: iterable
+    :param queue_size: maximum number of items waiting in the queue
+    :type queue_size: int
+    :return: the stage's output
+    :rtype: generator
+    """
+    items = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+
+    def put(item):
+        """Put an item onto the queue, unless the consumer has stopped.
+
+        :param item: item to put
+        :type item: object
+        :return: False if the consumer has stopped
+        :rtype: bool
+        """
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=PUT_TIMEOUT)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        """Put the stage's output onto the queue."""
+        try:
+            for item in stage:
+                if not put(item):
+                    # Consumer has stopped; close the stage too
+                    if hasattr(stage, "close"):
+                        stage.close()
+                    return
+        except BaseException as e:
+            put(_StageError(e))
+            return
+        put(_DONE)
+
+    threading.Thread(target=produce, daemon=True).start()
+
+    # Tell the stage to stop if the consumer stops early or fails
+    try:
+        while True:
+            item = items.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _StageError):
+                raise item.exception
+            yield item
+    finally:
+        stop.set()
+
+
+def read_text(text_file, size=READ_SIZE):
+    """Read text from a file in small chunks.
+
+    :param text_file: open text file
+    :type text_file: io.TextIOBase
+    :param size: characters per chunk
+    :type size: int
+    :return: chunks of text
+    :rtype: generator
+    """
+    return iter(lambda: text_file.read(size), "")
+
+
+def encrypt_text(enigma, text_chunks, group_size=GROUP_SIZE):
+    """Encrypt text, grouping the ciphertext.
+
+    Characters that aren't letters can't be typed on the machine and are
+    dropped.
+    :param enigma: the machine to encrypt with
+    :type enigma: enigma.enigma.Enigma
+    :param text_chunks: chunks of plaintext
+    :type text_chunks: iterable
+    :param group_size: ciphertext letters per group
+    :type group_size: int
+    :return: ciphertext letters, with a space between groups
+    :rtype: generator
+    """
+    letter_count = 0
+    for chunk in text_chunks:
+        for char in chunk.upper():
+            if char not in ALPHABET:
+                continue
+
+            if letter_count and letter_count % group_size == 0:
+                yield " "
+            yield enigma.press_key(char)
+            letter_count += 1
+
+
+def key_letters(letters):
+    """Key letters into Morse audio, one chunk per letter.
+
+    Each chunk starts with the gap that precedes its letter: a character gap
+    within a group, or a word gap after a space.
+    :param letters: letters, with spaces between words
+    :type letters: iterable
+    :return: 16-bit audio chunks
+    :rtype: generator
+    """
+    start = 0
+    gap = None
+    for letter in letters:
+        if letter == " ":
+            if gap is not None:
+                gap = WORD_GAP_SEGMENT
+            continue
+
+        segment = MORSE_SEGMENTS[letter]
+        if gap is not None:
+            segment = np.concatenate((gap, segment))
+        gap = CHAR_GAP_SEGMENT
+
+        audio = modulate(segment, start)
+        start += audio.size
+        yield (AMPLITUDE * audio).astype(np.int16)
+
+
+def transmit(
+    enigma, text_chunks, group_size=GROUP_SIZE, queue_size=QUEUE_SIZE
+):
+    """Build the threaded pipeline from text to Morse audio.
+
+    :param enigma: the machine to encrypt with
+    :type enigma: enigma.enigma.Enigma
+    :param text_chunks: chunks of plaintext
+    :type text_chunks: iterable
+    :param group_size: ciphertext letters per group
+    :type group_size: int
+    :param queue_size: maximum number of items waiting between stages
+    :type queue_size: int
+    :return: 16-bit audio chunks
+    :rtype: generator
+    """
+    letters = threaded(
+        encrypt_text(enigma, text_chunks, group_size), queue_size
+    )
+    return threaded(key_letters(letters), queue_size)
+
+
+def write_wav(audio_chunks, wav_path):
+    """Write audio chunks to a WAV file as they arrive.
+
+    :param audio_chunks: 16-bit audio chunks
+    :type audio_chunks: iterable
+    :param wav_path: path of the WAV file to write
+    :type wav_path: str
+    :return: number of samples written
+    :rtype: int
+    """
+    samples = 0
+    with wave.open(str(wav_path), "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(SAMPLE_RATE)
+        for chunk in audio_chunks:
+            wav_file.writeframes(chunk.tobytes())
+            samples += chunk.size
+
+    return samples
+
+
+def buffer_audio(audio_chunks, size):
+    """Join audio chunks into buffers of at least a given size.
+
+    :param audio_chunks: 16-bit audio chunks
+    :type audio_chunks: iterable
+    :param size: minimum samples per buffer; the last may be shorter
+    :type size: int
+    :return: 16-bit audio buffers
+    :rtype: generator
+    """
+    chunks = []
+    samples = 0
+    for chunk in audio_chunks:
+        chunks.append(chunk)
+        samples += chunk.size
+        if samples >= size:
+            yield np.concatenate(chunks)
+            chunks = []
+            samples = 0
+
+    if chunks:
+        yield np.concatenate(chunks)
+
+
+def play_audio(audio_chunks, play_seconds=PLAY_SECONDS):
+    """Play audio chunks as they arrive.
+
+    Chunks are joined into buffers of play_seconds of audio, and each buffer
+    is started as soon as the previous one finishes, while the next is
+    gathered. Starting playback takes a moment, so there is a short pause
+    between buffers; keeping buffers long keeps those pauses rare.
+    As with Keyer.play(), audio errors (including simpleaudio not being
+    installed) are caught and notified.
+    :param audio_chunks: 16-bit audio chunks
+    :type audio_chunks: iterable
+    :param play_seconds: seconds of audio played at a time
+    :type play_seconds: float
+    :return: number of samples played
+    :rtype: int
+    """
+    try:
+        import simpleaudio as sa
+    except ModuleNotFoundError:
+        print("There was an error with audio playback.")
+        return 0
+
+    samples = 0
+    play_obj = None
+    try:
+        for buffer in buffer_audio(
+            audio_chunks, int(play_seconds * SAMPLE_RATE)
+        ):
+            if play_obj is not None:
+                play_obj.wait_done()
+            play_obj = sa.play_buffer(buffer, 1, 2, SAMPLE_RATE)
+            samples += buffer.size
+        if play_obj is not None:
+            play_obj.wait_done()
+    except sa._simpleaudio.SimpleaudioError:
+        print("There was an error with audio playback.")
+
+    return samples
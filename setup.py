@@ -5,5 +5,11 @@ setup(
     version="0.0.1",
     description="An attempt to explore the Enigma ciphering system.",
     packages=["enigma"],
-    install_requires=["numpy", "simpleaudio", "pynput"],
+    install_requires=["numpy"],
+    extras_require={
+        # Audio playback
+        "audio": ["simpleaudio"],
+        # Interactive keyboard listener
+        "keyboard": ["pynput"],
+    },
 )
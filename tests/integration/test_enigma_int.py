@@ -1,4 +1,6 @@
 """Integration tests for the enigma module."""
+import mmap
+
 from enigma import enigma as en
 
 
@@ -37,3 +39,54 @@ def test_enigma():
         bulb = enigma.press_key("A")
         assert previous_bulb != bulb
         previous_bulb = bulb
+
+
+def test_rotor_trace_back():
+    """Test tracing back through a rotor inverts tracing through it."""
+    rotor = en.Rotor("DMTWSILRUYQNKFEJCAZBPGXOHV", "Q")
+    for position in range(en.ROTOR_LEN):
+        rotor.set_position(position)
+        for pin in range(en.ROTOR_LEN):
+            assert rotor.trace_back(rotor.trace(pin)) == pin
+
+
+def test_decrypt():
+    """Test finding keys from bulbs decrypts a message.
+
+    The message is long enough for rotors 2 and 3 to turn over.
+    """
+    message = "THEQUICKBROWNFOXJUMPSOVERTHELAZYDOG" * 30
+    enigma = en.Enigma("PDU")
+    ciphertext = "".join(enigma.press_key(letter) for letter in message)
+    assert ciphertext != message
+
+    enigma = en.Enigma("PDU")
+    plaintext = "".join(enigma.find_key(letter) for letter in ciphertext)
+    assert plaintext == message
+
+
+def test_encrypt_into(tmp_path):
+    """Test encrypting buffers matches pressing keys.
+
+    :param tmp_path: temporary directory
+    :type tmp_path: pathlib.Path
+    """
+    message = b"The quick brown fox, 1 lazy dog! " * 30
+    letters = [chr(byte).upper() for byte in message if chr(byte).isalpha()]
+    enigma = en.Enigma("PDU")
+    ciphertext = "".join(enigma.press_key(letter) for letter in letters)
+
+    # Into a bytearray, in two calls that continue the machine's state
+    enigma = en.Enigma("PDU")
+    dst = bytearray(len(message))
+    half = len(message) // 2
+    enigma.encrypt_into(message[:half], memoryview(dst)[:half])
+    enigma.encrypt_into(memoryview(message)[half:], memoryview(dst)[half:])
+    assert bytes(dst).upper().translate(None, b" ,1!") == ciphertext.encode()
+
+    # In place in a memory-mapped file
+    path = tmp_path / "message.txt"
+    path.write_bytes(message)
+    with open(path, "r+b") as f, mmap.mmap(f.fileno(), 0) as mapped:
+        assert en.Enigma("PDU").encrypt_into(mapped, mapped) == len(message)
+    assert path.read_bytes() == bytes(dst)
@@ -0,0 +1,15 @@
+"""Integration tests for the fuzz module."""
+from enigma import fuzz
+
+
+def test_fast_paths_match_reference():
+    """Test every fast path matches the reference machine.
+
+    Uses a new random seed each run; a failure reports the seed.
+    """
+    throughputs = fuzz.run(trials=50)
+
+    assert set(throughputs) == {"reference"} | set(fuzz.FAST_PATHS)
+    for name, throughput in throughputs.items():
+        print(f"{name}: {throughput / 1e6:.2f} MB/s")
+        assert throughput > 0
@@ -0,0 +1,61 @@
+"""Import-time benchmark for the cipher core and Morse codec."""
+import json
+import subprocess
+import sys
+
+import pytest
+
+HEAVY_MODULES = ["numpy", "simpleaudio", "pynput"]
+
+# Generous upper bound: the core only needs the standard library, so this is
+# orders of magnitude above a typical import time
+MAX_IMPORT_TIME = 0.25  # seconds
+
+IMPORT_SCRIPT = f"""
+import json
+import sys
+import time
+
+start = time.perf_counter()
+import enigma.enigma
+import enigma.morse
+elapsed = time.perf_counter() - start
+
+heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]
+print(json.dumps({{"elapsed": elapsed, "heavy": heavy}}))
+"""
+
+
+@pytest.fixture(scope="module")
+def import_result():
+    """Import the cipher core and Morse codec in a fresh interpreter.
+
+    :return: import time in seconds and any heavy modules that were loaded
+    :rtype: dict
+    """
+    completed = subprocess.run(
+        [sys.executable, "-c", IMPORT_SCRIPT],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(completed.stdout)
+
+
+def test_no_heavy_imports(import_result):
+    """Check importing Enigma and Morse doesn't load optional dependencies.
+
+    :param import_result: result of importing in a fresh interpreter
+    :type import_result: dict
+    """
+    assert import_result["heavy"] == []
+
+
+def test_import_time(import_result):
+    """Check importing Enigma and Morse is fast.
+
+    :param import_result: result of importing in a fresh interpreter
+    :type import_result: dict
+    """
+    print(f"Import time: {import_result['elapsed'] * 1000:.2f} ms")
+    assert import_result["elapsed"] < MAX_IMPORT_TIME
@@ -0,0 +1,95 @@
+"""Integration tests for the job module."""
+import json
+import os
+
+import pytest
+from enigma.__main__ import main
+from enigma.enigma import Enigma
+from enigma.job import EncryptionJob
+
+
+class Interrupted(Exception):
+    """Simulated crash of an encryption job."""
+
+
+def test_resume(tmp_path, monkeypatch):
+    """Test a resumed job gives the same output as an uninterrupted one.
+
+    :param tmp_path: temporary directory
+    :type tmp_path: pathlib.Path
+    :param monkeypatch: mocking fixture
+    :type monkeypatch: _pytest.monkeypatch.Monkeypatch
+    """
+    input_path = tmp_path / "plain.txt"
+    input_path.write_bytes(b"The quick brown fox jumps over a lazy dog. " * 50)
+    job_args = {"start_positions": "PDU", "block_size": 100}
+
+    uninterrupted_path = tmp_path / "uninterrupted.txt"
+    EncryptionJob(input_path, uninterrupted_path, **job_args).run()
+
+    # Crash part way through the 11th block, after a checkpoint at 8 blocks
+    output_path = tmp_path / "cipher.txt"
+    job = EncryptionJob(
+        input_path, output_path, checkpoint_every=4, **job_args
+    )
+    encrypt_into = Enigma.encrypt_into
+    calls = []
+
+    def crashing_encrypt_into(self, src, dst):
+        calls.append(None)
+        if len(calls) > 10:
+            raise Interrupted
+        return encrypt_into(self, src, dst)
+
+    monkeypatch.setattr(Enigma, "encrypt_into", crashing_encrypt_into)
+    with pytest.raises(Interrupted):
+        job.run()
+    monkeypatch.setattr(Enigma, "encrypt_into", encrypt_into)
+
+    with open(job.checkpoint_path) as f:
+        assert json.load(f)["offset"] == 800
+    assert os.path.getsize(output_path) > 800
+
+    # Resume with a new job, as after a restart
+    job = EncryptionJob(input_path, output_path, **job_args)
+    assert job.run() == os.path.getsize(input_path) - 800
+    assert output_path.read_bytes() == uninterrupted_path.read_bytes()
+    assert not os.path.exists(job.checkpoint_path)
+
+
+def test_resume_changed_input(tmp_path):
+    """Test a job isn't resumed after its input is rewritten.
+
+    :param tmp_path: temporary directory
+    :type tmp_path: pathlib.Path
+    """
+    input_path = tmp_path / "plain.txt"
+    input_path.write_bytes(b"A" * 100)
+    output_path = tmp_path / "cipher.txt"
+    EncryptionJob(input_path, output_path, block_size=10).run(max_blocks=5)
+
+    # Same size, different contents and modification time
+    mtime_ns = os.stat(input_path).st_mtime_ns
+    input_path.write_bytes(b"B" * 100)
+    os.utime(input_path, ns=(mtime_ns, mtime_ns + 10 ** 9))
+
+    with pytest.raises(ValueError):
+        EncryptionJob(input_path, output_path, block_size=10).run()
+
+
+@pytest.mark.parametrize("option", ["--block-size", "--checkpoint-every"])
+def test_encrypt_invalid_option(tmp_path, option):
+    """Test the encrypt command rejects sizes below 1.
+
+    :param tmp_path: temporary directory
+    :type tmp_path: pathlib.Path
+    :param option: command line option
+    :type option: str
+    """
+    input_path = tmp_path / "plain.txt"
+    input_path.write_bytes(b"ABCDEFGHIJ")
+    output_path = tmp_path / "cipher.txt"
+
+    with pytest.raises(SystemExit):
+        main(["encrypt", str(input_path), str(output_path), option, "0"])
+    assert not output_path.exists()
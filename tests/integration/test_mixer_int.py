@@ -0,0 +1,25 @@
+"""Integration tests for the mixer module."""
+import time
+import wave
+
+from enigma.__main__ import main
+from enigma.keyer import SAMPLE_RATE
+
+
+def test_mix_faster_than_real_time(tmp_path):
+    """Test mixing 64 channels to a WAV file runs faster than real time.
+
+    :param tmp_path: temporary directory
+    :type tmp_path: pathlib.Path
+    """
+    wav_path = tmp_path / "mix.wav"
+
+    start = time.perf_counter()
+    main(["mix", str(wav_path), "--duration", "10", "--seed", "0"])
+    elapsed = time.perf_counter() - start
+
+    with wave.open(str(wav_path), "rb") as wav_file:
+        duration = wav_file.getnframes() / SAMPLE_RATE
+
+    assert duration > 5
+    assert elapsed < duration
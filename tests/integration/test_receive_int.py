@@ -0,0 +1,22 @@
+"""Integration tests for the receive module."""
+from enigma.__main__ import main
+
+
+def test_transmit_receive(tmp_path, capsys):
+    """Test receiving a transmission recovers the plaintext.
+
+    :param tmp_path: temporary directory
+    :type tmp_path: pathlib.Path
+    :param capsys: output capturing fixture
+    :type capsys: _pytest.capture.CaptureFixture
+    """
+    text_path = tmp_path / "message.txt"
+    text_path.write_text("Attack at dawn, 0600\n")
+    wav_path = tmp_path / "message.wav"
+
+    main(
+        ["transmit", str(text_path), "--wav", str(wav_path), "--start", "XYZ"]
+    )
+    main(["receive", str(wav_path), "--start", "XYZ"])
+
+    assert capsys.readouterr().out == "ATTACKATDAWN\n"
@@ -0,0 +1,52 @@
+"""Integration tests for the replay module."""
+import io
+
+from enigma.__main__ import main
+from enigma.enigma import Enigma
+from enigma.replay import read_log, replay
+
+
+def test_replay_matches_machine():
+    """Test replaying a log lights the same bulbs as pressing the keys."""
+    text = "HELLOWORLD"
+    expected = Enigma()
+    expected_lines = "".join(
+        f"{letter} --> {expected.press_key(letter)}\n" for letter in text
+    )
+
+    log = io.StringIO("\n".join(text.lower()))
+    out = io.StringIO()
+    latencies = replay(Enigma(), read_log(log), out)
+
+    assert out.getvalue() == expected_lines
+    assert len(latencies) == len(text)
+
+
+def test_replay_named_keys():
+    """Test named keys don't step the rotors, and esc ends the replay."""
+    log = io.StringIO("h\nshift\ni\nesc\nj\n")
+    out = io.StringIO()
+    replay(Enigma(), read_log(log), out)
+
+    expected = Enigma()
+    assert out.getvalue() == (
+        f"H --> {expected.press_key('H')}\nI --> {expected.press_key('I')}\n"
+    )
+
+
+def test_replay_command(tmp_path, capsys):
+    """Test the replay command reports latencies.
+
+    :param tmp_path: temporary directory
+    :type tmp_path: pathlib.Path
+    :param capsys: output capturing fixture
+    :type capsys: _pytest.capture.CaptureFixture
+    """
+    log_path = tmp_path / "keys.log"
+    log_path.write_text("0.0 A\n0.001 A\n0.002 A\n")
+
+    main(["replay", str(log_path), "--timing"])
+    captured = capsys.readouterr()
+
+    assert captured.out.count("A --> ") == 3
+    assert captured.err.startswith("Keys: 3")
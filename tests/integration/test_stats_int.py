@@ -0,0 +1,45 @@
+"""Integration tests for the stats module."""
+import pytest
+from enigma.__main__ import main
+from enigma.enigma import Enigma
+from enigma.stats import file_stats
+
+
+def test_file_stats(tmp_path, capsys):
+    """Test statistics of an encrypted file, read in small blocks.
+
+    :param tmp_path: temporary directory
+    :type tmp_path: pathlib.Path
+    :param capsys: output capturing fixture
+    :type capsys: _pytest.capture.CaptureFixture
+    """
+    message = b"THE QUICK BROWN FOX JUMPS OVER THE LAZY DOG " * 200
+    ciphertext = bytearray(len(message))
+    Enigma().encrypt_into(message, ciphertext)
+    path = tmp_path / "cipher.txt"
+    path.write_bytes(ciphertext)
+
+    ciphertext_stats = file_stats(path, block_size=1000)
+    assert ciphertext_stats.total == 35 * 200
+    assert ciphertext_stats.frequencies().sum() == pytest.approx(1)
+
+    # Plaintext repeats every 35 letters; encryption hides that
+    assert ciphertext_stats.autocorrelation()[26] < 0.1
+
+    # Letters are spread evenly over the rotor 1 positions
+    bucket_sizes = ciphertext_stats.period_counts.sum(axis=1)
+    assert bucket_sizes.max() - bucket_sizes.min() <= 1
+
+    main(["stats", str(path), "--lags", "1", "35"])
+    assert "lag 35:" in capsys.readouterr().out
+
+
+def test_file_stats_empty(tmp_path):
+    """Test statistics of an empty file.
+
+    :param tmp_path: temporary directory
+    :type tmp_path: pathlib.Path
+    """
+    path = tmp_path / "empty.txt"
+    path.write_bytes(b"")
+    assert file_stats(path).total == 0
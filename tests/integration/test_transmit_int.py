@@ -0,0 +1,93 @@
+"""Integration tests for the transmit module."""
+import io
+import threading
+import time
+import wave
+
+import pytest
+
+from enigma.__main__ import main
+from enigma.enigma import Enigma
+from enigma.keyer import SAMPLE_RATE, text_to_signal
+from enigma.transmit import read_text, transmit
+
+SAMPLES_PER_DIT = SAMPLE_RATE // 10
+
+
+def test_transmit_wav(tmp_path):
+    """Test transmitting text to a WAV file.
+
+    :param tmp_path: temporary directory
+    :type tmp_path: pathlib.Path
+    """
+    text = "Attack at dawn"
+    text_path = tmp_path / "message.txt"
+    text_path.write_text(text)
+    wav_path = tmp_path / "message.wav"
+
+    main(["transmit", str(text_path), "--wav", str(wav_path)])
+
+    # Audio is the grouped ciphertext keyed in Morse
+    enigma = Enigma()
+    ciphertext = "".join(
+        enigma.press_key(char) for char in text.upper() if char != " "
+    )
+    groups = " ".join(ciphertext[i:i + 5] for i in range(0, 12, 5))
+    with wave.open(str(wav_path), "rb") as wav_file:
+        assert wav_file.getframerate() == SAMPLE_RATE
+        assert wav_file.getsampwidth() == 2
+        assert wav_file.getnframes() == (
+            text_to_signal(groups).size * SAMPLES_PER_DIT
+        )
+
+
+def test_transmit_group_size(tmp_path):
+    """Test a group size of less than 1 is rejected.
+
+    :param tmp_path: temporary directory
+    :type tmp_path: pathlib.Path
+    """
+    text_path = tmp_path / "message.txt"
+    text_path.write_text("Attack at dawn")
+
+    with pytest.raises(SystemExit):
+        main(["transmit", str(text_path), "--group-size", "0"])
+
+
+def wait_for_threads(threads, timeout=5):
+    """Wait for all threads but the given ones to exit.
+
+    :param threads: threads that may still be running
+    :type threads: set
+    :param timeout: seconds to wait
+    :type timeout: float
+    :return: True if the other threads exited in time
+    :rtype: bool
+    """
+    deadline = time.monotonic() + timeout
+    while set(threading.enumerate()) - threads:
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_first_audio_latency():
+    """Test the first audio arrives long before the input is consumed."""
+    # Far more text than could be keyed in the time allowed
+    text_file = io.StringIO("A" * 1000000)
+
+    threads = set(threading.enumerate())
+    start = time.perf_counter()
+    audio_chunks = transmit(Enigma(), read_text(text_file))
+    first_chunk = next(audio_chunks)
+    latency = time.perf_counter() - start
+
+    assert first_chunk.size > 0
+    assert latency < 0.1
+    # Only a bounded amount of the input has been read
+    assert text_file.tell() < 100000
+
+    # Closing the pipeline stops its threads
+    audio_chunks.close()
+    assert wait_for_threads(threads)
@@ -14,6 +14,8 @@ class TestEnigma:
             """Mock init for Rotor."""
             self.position = 0
             self.turnover_notch = 1
+            # Every input pin traces to pin 5, as in trace()
+            self.trace_table = [[5] * en.ROTOR_LEN] * en.ROTOR_LEN
 
         def step(self):
             """Mock advancing the rotor position."""
@@ -27,6 +29,22 @@ class TestEnigma:
             """
             return 5
 
+        def trace_back(self, *args):
+            """Mock tracing an output pin back to an input pin on rotor.
+
+            :return: input pin number on rotor
+            :rtype: int
+            """
+            return 2
+
+        def set_position(self, position):
+            """Mock turning the rotor to a position.
+
+            :param position: position of the rotor
+            :type position: int
+            """
+            self.position = position
+
     @pytest.fixture
     def enigma(self, monkeypatch):
         """Mocked fixture for an Enigma instance.
@@ -65,6 +83,58 @@ class TestEnigma:
         bulb = enigma.press_key("C")
         assert bulb == "F"
 
+    def test_encrypt_into(self, enigma):
+        """Test encrypting bytes into a buffer.
+
+        :param enigma: mocked Enigma instance fixture
+        :type enigma: enigma.enigma.Enigma
+        """
+        dst = bytearray(5)
+        assert enigma.encrypt_into(b"Cc 1", dst) == 4
+        # Letters keep their case; other bytes are copied unchanged
+        assert dst == bytearray(b"Ff 1\x00")
+
+        # Only letters step the rotors, as in step_rotors()
+        assert enigma.rotor1.position == 2
+        assert enigma.rotor2.position == 1
+
+        # In place
+        buf = bytearray(b"Cc")
+        enigma.encrypt_into(buf, buf)
+        assert buf == bytearray(b"Ff")
+
+        with pytest.raises(ValueError):
+            enigma.encrypt_into(b"ABC", bytearray(2))
+
+    def test_set_positions(self, enigma):
+        """Test setting the rotor positions from letters.
+
+        :param enigma: mocked Enigma instance fixture
+        :type enigma: enigma.enigma.Enigma
+        """
+        enigma.set_positions("bcd")
+        assert enigma.rotor1.position == 1
+        assert enigma.rotor2.position == 2
+        assert enigma.rotor3.position == 3
+
+        with pytest.raises(ValueError):
+            enigma.set_positions("AB")
+        with pytest.raises(ValueError):
+            enigma.set_positions("A1B")
+
+    def test_find_key(self, enigma, monkeypatch):
+        """Test finding the key that lights a bulb.
+
+        :param enigma: mocked Enigma instance fixture
+        :type enigma: enigma.enigma.Enigma
+        :param monkeypatch: mocking fixture
+        :type monkeypatch: _pytest.monkeypatch.Monkeypatch
+        """
+        monkeypatch.setattr(enigma, "step_rotors", lambda: None)
+
+        key = enigma.find_key("F")
+        assert key == "C"
+
     def test_step_rotors(self, enigma, monkeypatch):
         """Check mocked rotors step and turn over as expected.
 
@@ -166,6 +236,20 @@ class TestRotor:
         rotor.step()
         assert rotor.position == 1
 
+    def test_set_position(self, monkeypatch):
+        """Test turning the rotor to a position.
+
+        :param monkeypatch: mocking fixture
+        :type monkeypatch: _pytest.monkeypatch.Monkeypatch
+        """
+        monkeypatch.setattr(en.Rotor, "__init__", lambda *args: None)
+
+        rotor = en.Rotor()
+        rotor.set_position(25)
+        assert rotor.position == 25
+        rotor.step()
+        assert rotor.position == 0
+
     def test_trace(self, rotor):
         """Test tracing an input pin through to an output pin.
 
@@ -174,3 +258,17 @@ class TestRotor:
         """
         assert rotor.trace(1) == 17
         assert rotor.trace(2) == 6
+
+    def test_trace_back(self, rotor, monkeypatch):
+        """Test tracing an output pin back to an input pin.
+
+        :param rotor: mocked instance of Rotor
+        :type rotor: enigma.enigma.Rotor
+        :param monkeypatch: mocking fixture
+        :type monkeypatch: _pytest.monkeypatch.Monkeypatch
+        """
+        monkeypatch.setattr(
+            rotor, "inverse_wiring", {3: 0, 17: 1, 6: 2}, raising=False
+        )
+        assert rotor.trace_back(17) == 1
+        assert rotor.trace_back(6) == 2
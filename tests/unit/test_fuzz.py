@@ -0,0 +1,68 @@
+"""Unit tests for the fuzz module."""
+import random
+
+import pytest
+from enigma import fuzz
+from enigma.enigma import Enigma
+
+
+def test_random_case():
+    """Test random cases are repeatable and within bounds."""
+    case = fuzz.random_case(random.Random(1), 100)
+    assert case == fuzz.random_case(random.Random(1), 100)
+
+    start_positions, message, bounds = case
+    assert len(start_positions) == 3
+    assert len(message) <= 100 + 16
+    assert bounds == sorted(bounds)
+    assert all(0 <= bound <= len(message) for bound in bounds)
+
+
+def test_reference():
+    """Test the reference keeps case and passes other bytes through."""
+    ciphertext, positions = fuzz.reference("AAA", b"Aa 1", [])
+    assert ciphertext[0:1].isupper()
+    assert ciphertext[1:2].islower()
+    assert ciphertext[2:] == b" 1"
+    assert positions == (2, 0, 0)
+
+
+def test_check_case_mismatch():
+    """Test a path that doesn't match the reference is caught."""
+
+    def broken(start_positions, message, bounds):
+        ciphertext, positions = fuzz.reference(
+            start_positions, message, bounds
+        )
+        return ciphertext[:-1] + b"?", positions
+
+    with pytest.raises(fuzz.EquivalenceError, match="at byte 3"):
+        fuzz.check_case("AAA", b"ABCD", [], paths={"broken": broken})
+
+
+def test_check_case_positions():
+    """Test a path that leaves the rotors in the wrong place is caught."""
+
+    def broken(start_positions, message, bounds):
+        ciphertext, positions = fuzz.reference(
+            start_positions, message, bounds
+        )
+        return ciphertext, (0, 0, 0)
+
+    with pytest.raises(fuzz.EquivalenceError, match="rotor positions"):
+        fuzz.check_case("AAA", b"ABCD", [], paths={"broken": broken})
+
+
+def test_check_inverse(monkeypatch):
+    """Test find_key() is checked separately from the fast paths.
+
+    :param monkeypatch: mocking fixture
+    :type monkeypatch: _pytest.monkeypatch.Monkeypatch
+    """
+    ciphertext, positions = fuzz.reference("AAA", b"ABCD", [])
+    fuzz.check_inverse("AAA", b"ABCD", ciphertext, positions)
+
+    # A find_key() that doesn't invert press_key()
+    monkeypatch.setattr(Enigma, "find_key", Enigma.press_key)
+    with pytest.raises(fuzz.EquivalenceError, match="find_key"):
+        fuzz.check_case("AAA", b"ABCD", [], paths={})
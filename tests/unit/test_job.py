@@ -0,0 +1,151 @@
+"""Unit tests for the job module."""
+import json
+import os
+
+import pytest
+from enigma.job import EncryptionJob
+
+
+@pytest.fixture
+def job(tmp_path):
+    """Create a job encrypting a small file in small blocks.
+
+    :param tmp_path: temporary directory
+    :type tmp_path: pathlib.Path
+    :return: EncryptionJob object
+    :rtype: enigma.job.EncryptionJob
+    """
+    input_path = tmp_path / "plain.txt"
+    input_path.write_bytes(b"ABCDEFGHIJ")
+    return EncryptionJob(
+        input_path,
+        tmp_path / "cipher.txt",
+        start_positions="abc",
+        block_size=3,
+        checkpoint_every=1,
+    )
+
+
+def test_init(job):
+    """Test initialisation of EncryptionJob.
+
+    :param job: EncryptionJob object
+    :type job: enigma.job.EncryptionJob
+    """
+    assert job.checkpoint_path.endswith("cipher.txt.checkpoint")
+    assert job.start_positions == "ABC"
+    assert job.enigma.rotor2.position == 1
+
+
+@pytest.mark.parametrize(
+    "block_size, checkpoint_every", [(0, 1), (3, 0), (-1, 1)]
+)
+def test_init_invalid(tmp_path, block_size, checkpoint_every):
+    """Test block sizes and checkpoint intervals below 1 are rejected.
+
+    :param tmp_path: temporary directory
+    :type tmp_path: pathlib.Path
+    :param block_size: bytes encrypted at a time
+    :type block_size: int
+    :param checkpoint_every: blocks encrypted between checkpoints
+    :type checkpoint_every: int
+    """
+    with pytest.raises(ValueError):
+        EncryptionJob(
+            tmp_path / "plain.txt",
+            tmp_path / "cipher.txt",
+            block_size=block_size,
+            checkpoint_every=checkpoint_every,
+        )
+
+
+def test_write_checkpoint(job):
+    """Test the checkpoint records progress and rotor positions.
+
+    :param job: EncryptionJob object
+    :type job: enigma.job.EncryptionJob
+    """
+    job.write_checkpoint(6, os.stat(job.input_path))
+    with open(job.checkpoint_path) as f:
+        checkpoint = json.load(f)
+
+    assert checkpoint["offset"] == 6
+    assert checkpoint["output_length"] == 6
+    assert checkpoint["rotor1"] == 0
+    assert checkpoint["rotor2"] == 1
+    assert checkpoint["rotor3"] == 2
+    assert checkpoint["input_size"] == 10
+    assert checkpoint["input_mtime_ns"] == os.stat(job.input_path).st_mtime_ns
+
+
+def test_read_checkpoint(job):
+    """Test reading a checkpoint, rejecting one from another job.
+
+    :param job: EncryptionJob object
+    :type job: enigma.job.EncryptionJob
+    """
+    input_stat = os.stat(job.input_path)
+    assert job.read_checkpoint(input_stat) is None
+
+    job.write_checkpoint(6, input_stat)
+    with pytest.raises(ValueError):
+        # No output file yet
+        job.read_checkpoint(input_stat)
+
+    with open(job.output_path, "wb") as f:
+        f.write(b"ABCDE")
+    with pytest.raises(ValueError):
+        # Output shorter than the checkpoint
+        job.read_checkpoint(input_stat)
+
+    with open(job.output_path, "ab") as f:
+        f.write(b"F")
+    assert job.read_checkpoint(input_stat)["offset"] == 6
+
+    # Input rewritten with the same size
+    with open(job.input_path, "wb") as f:
+        f.write(b"KLMNOPQRST")
+    os.utime(job.input_path, ns=(0, input_stat.st_mtime_ns + 10 ** 9))
+    with pytest.raises(ValueError):
+        job.read_checkpoint(os.stat(job.input_path))
+
+
+def test_run(job):
+    """Test running a job to completion removes its checkpoint.
+
+    :param job: EncryptionJob object
+    :type job: enigma.job.EncryptionJob
+    """
+    assert job.run() == 10
+    with open(job.output_path, "rb") as f:
+        assert len(f.read()) == 10
+
+    with pytest.raises(FileNotFoundError):
+        open(job.checkpoint_path)
+
+
+def test_run_same_file(tmp_path):
+    """Test a job encrypting a file onto itself is rejected untouched.
+
+    :param tmp_path: temporary directory
+    :type tmp_path: pathlib.Path
+    """
+    path = tmp_path / "plain.txt"
+    path.write_bytes(b"ABCDEFGHIJ")
+    link_path = tmp_path / "link.txt"
+    os.symlink(path, link_path)
+
+    for output_path in (path, link_path):
+        with pytest.raises(ValueError):
+            EncryptionJob(path, output_path).run()
+    assert path.read_bytes() == b"ABCDEFGHIJ"
+
+
+def test_run_max_blocks(job):
+    """Test stopping a job early leaves a checkpoint to resume from.
+
+    :param job: EncryptionJob object
+    :type job: enigma.job.EncryptionJob
+    """
+    assert job.run(max_blocks=2) == 6
+    assert job.read_checkpoint(os.stat(job.input_path))["offset"] == 6
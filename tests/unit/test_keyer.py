@@ -1,7 +1,19 @@
 """Unit tests for keyer module."""
+import sys
+
 import pytest
 import numpy as np
-from enigma.keyer import Keyer
+from enigma.keyer import (
+    MORSE_TABLE,
+    Keyer,
+    create_segment,
+    modulate,
+    morse_number,
+    signal_to_text,
+    signals_to_text,
+    text_to_signal,
+)
+from enigma.morse import MORSE_CODE
 
 
 def mock_signal(*args):
@@ -73,6 +85,111 @@ def test_create_binary_signal(monkeypatch):
     np.testing.assert_array_equal(signal, signal_exp)
 
 
+def test_create_segment():
+    """Test a single character's binary segment has no trailing gap."""
+    np.testing.assert_array_equal(create_segment(".-"), [1, 0, 1, 1, 1])
+    np.testing.assert_array_equal(create_segment("-"), [1, 1, 1])
+
+
+def test_text_to_signal():
+    """Test text to binary conversion with character and word gaps."""
+    # Character gap of 3 dits
+    signal = text_to_signal("et")
+    np.testing.assert_array_equal(signal, [1, 0, 0, 0, 1, 1, 1])
+
+    # Word gap of 7 dits, regardless of the amount of whitespace
+    signal_exp = [1] + 7 * [0] + [1, 1, 1]
+    np.testing.assert_array_equal(text_to_signal("E T"), signal_exp)
+    np.testing.assert_array_equal(text_to_signal(" E   T "), signal_exp)
+
+    assert text_to_signal("").size == 0
+
+
+def test_morse_number():
+    """Test numbering Morse codes and looking them up."""
+    assert morse_number(".-") == 0b101
+    assert morse_number("..-") == 0b1001
+    assert MORSE_TABLE[morse_number(".-")] == "A"
+    assert MORSE_TABLE[morse_number("-----")] == "0"
+    assert MORSE_TABLE[0] == "?"
+
+
+def test_signal_to_text():
+    """Test decoding a binary signal to text."""
+    assert signal_to_text(np.array([1, 0, 0, 0, 1, 1, 1])) == "ET"
+
+    # Leading and trailing silence is ignored; extra word gap is one space
+    signal = [0, 0, 1] + 12 * [0] + [1, 1, 1, 0, 0]
+    assert signal_to_text(signal) == "E T"
+
+    # Too many elements for any character
+    assert signal_to_text(np.array([1, 0] * 6)) == "?"
+    assert signal_to_text(np.array([])) == ""
+
+
+def test_signal_to_text_oversampled():
+    """Test decoding a signal with several samples per dit."""
+    signal = np.repeat(text_to_signal("E T"), 4)
+    assert signal_to_text(signal, samples_per_dit=4) == "E T"
+
+
+def test_signals_to_text():
+    """Test decoding a batch of signals in one call."""
+    signals = [
+        text_to_signal("SOS"),
+        np.zeros(0),
+        np.zeros(10),
+        text_to_signal("A B"),
+    ]
+    assert signals_to_text(signals) == ["SOS", "", "", "A B"]
+    assert signals_to_text([]) == []
+
+
+def test_signals_to_text_round_trip():
+    """Test a batch of keyed messages decodes back to the same text."""
+    rng = np.random.default_rng(0)
+    chars = list(MORSE_CODE)
+    texts = [
+        " ".join(
+            "".join(rng.choice(chars, size=rng.integers(1, 8)))
+            for _ in range(rng.integers(1, 10))
+        )
+        for _ in range(100)
+    ]
+    signals = [text_to_signal(text) for text in texts]
+    assert signals_to_text(signals) == texts
+
+    oversampled = [np.repeat(signal, 3) for signal in signals]
+    assert signals_to_text(oversampled, samples_per_dit=3) == texts
+
+
+def test_from_text(monkeypatch):
+    """Test creating a Keyer straight from text.
+
+    :param monkeypatch: fixture for mocking
+    :type monkeypatch: _pytest.monkeypatch.MonkeyPatch
+    """
+    monkeypatch.setattr(Keyer, "convert_audio", mock_audio)
+    keyer = Keyer.from_text("A")
+    np.testing.assert_array_equal(keyer.signal, [1, 0, 1, 1, 1])
+    assert keyer.audio.dtype == np.dtype("int16")
+
+
+def test_modulate():
+    """Test keying the carrier, continuing its phase between signals."""
+    signal = np.array([1, 0, 1])
+    audio = modulate(signal)
+    assert audio.size == 3 * 4410
+    assert np.all(audio[4410:8820] == 0)
+    assert np.max(np.abs(audio)) <= 1
+
+    # Modulating in two parts gives the same audio as all at once
+    audio_split = np.concatenate(
+        (modulate(signal[:2]), modulate(signal[2:], start=8820))
+    )
+    np.testing.assert_allclose(audio_split, audio, atol=1e-9)
+
+
 def test_convert_audio(monkeypatch):
     """Test conversion of binary to audio.
 
@@ -100,3 +217,19 @@ def test_play(keyer):
     """
     # Just check no exceptions are thrown
     keyer.play()
+
+
+def test_play_without_simpleaudio(keyer, monkeypatch, capsys):
+    """Check playing without simpleaudio installed notifies the error.
+
+    :param keyer: Keyer object
+    :type keyer: enigma.keyer.Keyer
+    :param monkeypatch: mocking fixture
+    :type monkeypatch: _pytest.monkeypatch.Monkeypatch
+    :param capsys: output capturing fixture
+    :type capsys: _pytest.capture.CaptureFixture
+    """
+    # Make importing simpleaudio fail
+    monkeypatch.setitem(sys.modules, "simpleaudio", None)
+    keyer.play()
+    assert "error with audio playback" in capsys.readouterr().out
@@ -0,0 +1,91 @@
+"""Unit tests for the mixer module."""
+import numpy as np
+import pytest
+from enigma import mixer
+from enigma.keyer import SAMPLE_RATE, modulate, text_to_signal
+
+
+@pytest.fixture
+def channel():
+    """Create a channel starting one dit into the mix.
+
+    :return: Channel object
+    :rtype: enigma.mixer.Channel
+    """
+    return mixer.Channel("ET", 440, dit_freq=10, offset=0.1)
+
+
+def test_init(channel):
+    """Test initialisation of Channel.
+
+    :param channel: Channel object
+    :type channel: enigma.mixer.Channel
+    """
+    np.testing.assert_array_equal(channel.signal, text_to_signal("ET"))
+    assert channel.start == 4410
+    assert channel.end == 4410 + 7 * 4410
+    assert channel.period == 2205
+
+
+def test_carrier_samples(channel):
+    """Test carrier samples match the keyer's carrier.
+
+    :param channel: Channel object
+    :type channel: enigma.mixer.Channel
+    """
+    on = np.ones(1, dtype=np.int8)
+    carrier_exp = modulate(on, start=5000)[:100]
+    np.testing.assert_allclose(
+        channel.carrier_samples(5000, 100), carrier_exp, atol=1e-6
+    )
+
+
+def test_channel_render(channel):
+    """Test rendering a channel in parts matches the keyer.
+
+    :param channel: Channel object
+    :type channel: enigma.mixer.Channel
+    """
+    out = np.zeros(10 * 4410, dtype=np.float32)
+    # Render in uneven parts that don't line up with dits
+    for start in range(0, out.size, 3000):
+        channel.render(start, out[start:start + 3000])
+
+    audio_exp = np.zeros(out.size)
+    audio_exp[4410:4410 + 7 * 4410] = modulate(text_to_signal("ET"))
+    np.testing.assert_allclose(out, audio_exp, atol=1e-6)
+
+
+def test_mixer():
+    """Test mixing channels without clipping."""
+    channels = [
+        mixer.Channel("EE", 441 * (i + 1), amplitude=1) for i in range(4)
+    ]
+    mix = mixer.Mixer(channels)
+    assert mix.length == 5 * 4410
+
+    chunks = list(mix.stream(chunk_size=10000))
+    assert [chunk.size for chunk in chunks] == [10000, 10000, 2050]
+    assert all(chunk.dtype == np.dtype("int16") for chunk in chunks)
+
+    # All carriers peak together at a quarter cycle of the 441 Hz carrier
+    audio = np.concatenate(chunks)
+    assert audio.max() <= mixer.AMPLITUDE
+    assert audio.max() > 0.9 * mixer.AMPLITUDE / 4
+
+
+def test_random_channels():
+    """Test random channels are repeatable and fill the duration."""
+    channels = mixer.random_channels(8, 30, seed=1)
+    assert len(channels) == 8
+    assert len({channel.frequency for channel in channels}) == 8
+    assert all(
+        20 * SAMPLE_RATE < channel.end < 40 * SAMPLE_RATE
+        for channel in channels
+    )
+
+    repeat = mixer.random_channels(8, 30, seed=1)
+    np.testing.assert_array_equal(channels[3].signal, repeat[3].signal)
+
+    with pytest.raises(ValueError):
+        mixer.random_channels(0, 30)
@@ -0,0 +1,120 @@
+"""Unit tests for the receive module."""
+import io
+import wave
+
+import numpy as np
+from enigma import receive
+from enigma.keyer import SAMPLE_RATE, modulate, text_to_signal
+
+
+class MockEnigma:
+    """Mock Enigma machine where each key lights its own bulb."""
+
+    def __init__(self):
+        """Count rotor steps."""
+        self.steps = 0
+
+    def find_key(self, bulb_lit):
+        """Mock finding the key that lights a bulb.
+
+        :param bulb_lit: the letter bulb that lit up
+        :type bulb_lit: str
+        :return: the key that was pressed
+        :rtype: str
+        """
+        self.steps += 1
+        return bulb_lit
+
+    def step_rotors(self):
+        """Mock stepping the rotors."""
+        self.steps += 1
+
+
+def test_read_wav():
+    """Test reading the first channel of a WAV file in chunks."""
+    stereo = np.arange(10, dtype=np.int16).repeat(2)
+    wav_bytes = io.BytesIO()
+    with wave.open(wav_bytes, "wb") as wav_file:
+        wav_file.setnchannels(2)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(SAMPLE_RATE)
+        wav_file.writeframes(stereo.tobytes())
+
+    wav_bytes.seek(0)
+    with wave.open(wav_bytes, "rb") as wav_file:
+        chunks = list(receive.read_wav(wav_file, chunk_frames=4))
+
+    assert [chunk.size for chunk in chunks] == [4, 4, 2]
+    np.testing.assert_array_equal(np.concatenate(chunks), np.arange(10))
+
+
+def test_detect_tone():
+    """Test detecting the tone across chunk boundaries."""
+    signal = np.array([0, 1, 0])
+    audio = (20000 * modulate(signal)).astype(np.int16)
+    window = receive.window_size()
+
+    # Split at a point that isn't a window boundary
+    chunks = [audio[:window + 7], audio[window + 7:]]
+    keyed = np.concatenate(list(receive.detect_tone(chunks)))
+
+    np.testing.assert_array_equal(
+        keyed, np.repeat(signal, receive.WINDOWS_PER_DIT).astype(bool)
+    )
+
+
+def test_detect_tone_silence():
+    """Test silence isn't detected as a tone."""
+    silence = np.zeros(SAMPLE_RATE, dtype=np.int16)
+    keyed = next(receive.detect_tone([silence]))
+    assert not keyed.any()
+
+
+def test_signal_runs():
+    """Test runs are joined across chunks."""
+    chunks = [
+        np.array([False, True, True]),
+        np.array([], dtype=bool),
+        np.array([True, False]),
+    ]
+    runs = list(receive.signal_runs(chunks))
+    assert runs == [(False, 1), (True, 3), (False, 1)]
+
+
+def test_runs_to_symbols():
+    """Test classifying runs, ignoring leading silence."""
+    runs = [(False, 50), (True, 1), (False, 1), (True, 3), (False, 3)]
+    runs += [(True, 1), (False, 7), (True, 3)]
+    symbols = "".join(receive.runs_to_symbols(runs, windows_per_dit=1))
+    assert symbols == ".- ./-"
+
+
+def test_decode_symbols():
+    """Test decoding symbols, including unknown codes."""
+    letters = "".join(receive.decode_symbols(".- ./...... ..-- -"))
+    assert letters == "AE ??T"
+
+
+def test_decrypt_letters():
+    """Test decrypting letters, stepping rotors for unknown ones."""
+    enigma = MockEnigma()
+    plaintext = "".join(receive.decrypt_letters(enigma, "AB ?C"))
+    assert plaintext == "AB?C"
+    assert enigma.steps == 4
+
+
+def test_receive():
+    """Test receiving keyed audio."""
+    audio = (20000 * modulate(text_to_signal("SOS HI"))).astype(np.int16)
+    wav_bytes = io.BytesIO()
+    with wave.open(wav_bytes, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(SAMPLE_RATE)
+        wav_file.writeframes(audio.tobytes())
+
+    wav_bytes.seek(0)
+    with wave.open(wav_bytes, "rb") as wav_file:
+        plaintext = "".join(receive.receive(MockEnigma(), wav_file))
+
+    assert plaintext == "SOSHI"
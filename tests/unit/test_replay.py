@@ -0,0 +1,170 @@
+"""Unit tests for the replay module."""
+import io
+
+import pytest
+from enigma import replay
+
+
+class MockEnigma:
+    """Mock Enigma machine that always lights the same bulb."""
+
+    def press_key(self, letter_input):
+        """Mock pressing a key on the machine.
+
+        :param letter_input: the key pressed
+        :type letter_input: str
+        :return: the letter bulb that lights up
+        :rtype: str
+        """
+        return "F"
+
+
+@pytest.fixture
+def enigma():
+    """Create a mocked Enigma instance.
+
+    :return: mocked Enigma instance
+    :rtype: MockEnigma
+    """
+    return MockEnigma()
+
+
+def test_light_bulb(enigma):
+    """Test the key handler output line.
+
+    :param enigma: mocked Enigma instance
+    :type enigma: MockEnigma
+    """
+    assert replay.light_bulb(enigma, "c") == "C --> F"
+
+
+def test_read_log():
+    """Test reading keys with and without times from a keystroke log."""
+    log = io.StringIO("A\n\n0.5 b\n")
+    assert list(replay.read_log(log)) == [(None, "A"), (0.5, "b")]
+
+    log = io.StringIO("5\n0.5 shift\n")
+    assert list(replay.read_log(log)) == [(None, "5"), (0.5, "shift")]
+
+
+@pytest.mark.parametrize("line", ["0.25", "0.25 A B", "soon A"])
+def test_read_log_malformed(line):
+    """Test malformed lines are rejected with their line number.
+
+    :param line: malformed log line
+    :type line: str
+    """
+    log = io.StringIO(f"A\n\n{line}\n")
+    with pytest.raises(ValueError, match="Line 3 "):
+        list(replay.read_log(log))
+
+
+def test_replay(enigma, monkeypatch):
+    """Test replaying keystrokes writes buffered output.
+
+    :param enigma: mocked Enigma instance
+    :type enigma: MockEnigma
+    :param monkeypatch: mocking fixture
+    :type monkeypatch: _pytest.monkeypatch.Monkeypatch
+    """
+    # Flush mid-replay as well as at the end
+    monkeypatch.setattr(replay, "FLUSH_LINES", 2)
+    out = io.StringIO()
+    keystrokes = [(None, "a"), (None, "b"), (0.0, "c")]
+    latencies = replay.replay(enigma, keystrokes, out)
+
+    assert out.getvalue() == "A --> F\nB --> F\nC --> F\n"
+    assert len(latencies) == 3
+    assert all(latency >= 0 for latency in latencies)
+
+
+def test_replay_named_keys(enigma):
+    """Test named keys are skipped and esc ends the replay.
+
+    :param enigma: mocked Enigma instance
+    :type enigma: MockEnigma
+    """
+    out = io.StringIO()
+    keystrokes = [(None, "a"), (None, "shift"), (None, "ESC"), (None, "b")]
+    latencies = replay.replay(enigma, keystrokes, out)
+
+    assert out.getvalue() == "A --> F\n"
+    assert len(latencies) == 1
+
+
+def test_replay_timing(enigma):
+    """Test replaying keystrokes at their recorded times.
+
+    :param enigma: mocked Enigma instance
+    :type enigma: MockEnigma
+    """
+    out = io.StringIO()
+    latencies = replay.replay(
+        enigma, [(0.0, "a"), (0.01, "b")], out, timing=True
+    )
+    assert out.getvalue() == "A --> F\nB --> F\n"
+    assert len(latencies) == 2
+
+
+class FakeClock:
+    """Fake clock whose sleeps always overrun."""
+
+    def __init__(self, oversleep):
+        """Start the clock at 0.
+
+        :param oversleep: extra seconds added to every sleep
+        :type oversleep: float
+        """
+        self.now = 0.0
+        self.oversleep = oversleep
+
+    def perf_counter(self):
+        """Current time.
+
+        :return: seconds since the clock started
+        :rtype: float
+        """
+        return self.now
+
+    def sleep(self, seconds):
+        """Advance the clock, overrunning the requested time.
+
+        :param seconds: seconds to sleep
+        :type seconds: float
+        """
+        self.now += seconds + self.oversleep
+
+
+def test_replay_timing_oversleep(enigma, monkeypatch):
+    """Test oversleeping isn't counted as latency, but running behind is.
+
+    :param enigma: mocked Enigma instance
+    :type enigma: MockEnigma
+    :param monkeypatch: mocking fixture
+    :type monkeypatch: _pytest.monkeypatch.Monkeypatch
+    """
+    clock = FakeClock(oversleep=0.01)
+    monkeypatch.setattr(replay.time, "perf_counter", clock.perf_counter)
+    monkeypatch.setattr(replay.time, "sleep", clock.sleep)
+
+    # "b" is waited for and oversleeps to 0.02; "c" is then 0.005 late
+    keystrokes = [(0.0, "a"), (0.01, "b"), (0.015, "c")]
+    latencies = replay.replay(enigma, keystrokes, io.StringIO(), timing=True)
+    assert latencies == pytest.approx([0, 0, 0.005])
+
+
+def test_latency_histogram():
+    """Test latencies are counted into the right buckets."""
+    counts = replay.latency_histogram([0.5e-6, 1.5e-6, 3e-6, 2e-3])
+    assert counts[:3] == [1, 1, 1]
+    assert counts[-1] == 1
+    assert sum(counts) == 4
+
+
+def test_format_report():
+    """Test the latency report."""
+    assert replay.format_report([]) == "No keys pressed."
+
+    report = replay.format_report([1e-6, 2e-6, 3e-6])
+    assert report.startswith("Keys: 3\n")
+    assert "p50 2.0" in report
@@ -0,0 +1,83 @@
+"""Unit tests for the stats module."""
+import numpy as np
+import pytest
+from enigma import stats
+
+
+def as_block(text):
+    """Convert text to a block of bytes.
+
+    :param text: text
+    :type text: str
+    :return: block of bytes
+    :rtype: np.ndarray
+    """
+    return np.frombuffer(text.encode("latin-1"), dtype=np.uint8)
+
+
+def test_init():
+    """Test initialisation of CiphertextStats."""
+    ciphertext_stats = stats.CiphertextStats(lags=[3, 1, 3], period=4)
+    assert ciphertext_stats.lags == [1, 3]
+    assert ciphertext_stats.period_counts.shape == (4, 26)
+    assert ciphertext_stats.total == 0
+
+    with pytest.raises(ValueError):
+        stats.CiphertextStats(lags=[0])
+
+
+def test_update():
+    """Test counting letters, skipping other bytes."""
+    ciphertext_stats = stats.CiphertextStats(lags=[1], period=2)
+    ciphertext_stats.update(as_block("Ab, a[@`\xc1z"))
+
+    assert ciphertext_stats.total == 4
+    assert ciphertext_stats.counts[0] == 2
+    assert ciphertext_stats.counts[1] == 1
+    assert ciphertext_stats.counts[25] == 1
+
+    # Letters alternate between the two buckets: A, B, A, Z
+    assert ciphertext_stats.period_counts[0, 0] == 2
+    assert ciphertext_stats.period_counts[1, 1] == 1
+    assert ciphertext_stats.period_counts[1, 25] == 1
+
+
+def test_update_across_blocks():
+    """Test statistics don't depend on where blocks are split."""
+    text = "THEQUICKBROWNFOXJUMPSOVERTHELAZYDOG" * 10
+    whole = stats.CiphertextStats(lags=[1, 2, 26], period=5)
+    whole.update(as_block(text))
+
+    split = stats.CiphertextStats(lags=[1, 2, 26], period=5)
+    for start in range(0, len(text), 7):
+        split.update(as_block(text[start:start + 7]))
+
+    np.testing.assert_array_equal(split.period_counts, whole.period_counts)
+    assert split.autocorrelation() == whole.autocorrelation()
+
+
+def test_autocorrelation():
+    """Test autocorrelation at different lags."""
+    ciphertext_stats = stats.CiphertextStats(lags=[1, 2])
+    ciphertext_stats.update(as_block("ABABAB"))
+    assert ciphertext_stats.autocorrelation() == {1: 0.0, 2: 1.0}
+
+
+def test_index_of_coincidence():
+    """Test the index of coincidence of letter counts."""
+    counts = np.zeros(26, dtype=np.int64)
+    assert stats.index_of_coincidence(counts) == 0
+
+    counts[0] = 2
+    counts[1] = 2
+    assert stats.index_of_coincidence(counts) == pytest.approx(4 / 12)
+
+
+def test_report():
+    """Test the report includes each statistic."""
+    ciphertext_stats = stats.CiphertextStats()
+    ciphertext_stats.update(as_block("HELLO"))
+    report = ciphertext_stats.report()
+    assert report.startswith("Letters: 5\n")
+    assert "L: 0.40000" in report
+    assert "lag 26:" in report
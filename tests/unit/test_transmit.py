@@ -0,0 +1,98 @@
+"""Unit tests for the transmit module."""
+import io
+import threading
+import time
+
+import numpy as np
+import pytest
+from enigma import transmit
+from enigma.keyer import modulate, text_to_signal
+
+
+class MockEnigma:
+    """Mock Enigma machine that lights the bulb of the key pressed."""
+
+    def press_key(self, letter_input):
+        """Mock pressing a key on the machine.
+
+        :param letter_input: the key pressed
+        :type letter_input: str
+        :return: the letter bulb that lights up
+        :rtype: str
+        """
+        return letter_input
+
+
+def test_threaded():
+    """Test a threaded stage yields all items in order."""
+    assert list(transmit.threaded(iter(range(100)), queue_size=2)) == list(
+        range(100)
+    )
+
+
+def test_threaded_error():
+    """Test an exception in a threaded stage is raised downstream."""
+
+    def failing_stage():
+        yield 1
+        raise ValueError("stage failed")
+
+    stage = transmit.threaded(failing_stage())
+    assert next(stage) == 1
+    with pytest.raises(ValueError):
+        next(stage)
+
+
+def test_threaded_close():
+    """Test the stage's thread exits when the consumer stops early."""
+    threads = set(threading.enumerate())
+    stage = transmit.threaded(iter(range(100)), queue_size=2)
+    assert next(stage) == 0
+    stage.close()
+
+    deadline = time.monotonic() + 5
+    while set(threading.enumerate()) - threads:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_read_text():
+    """Test reading text in chunks."""
+    chunks = list(transmit.read_text(io.StringIO("abcde"), size=2))
+    assert chunks == ["ab", "cd", "e"]
+
+
+def test_encrypt_text():
+    """Test non-letters are dropped and the ciphertext is grouped."""
+    letters = transmit.encrypt_text(
+        MockEnigma(), ["ab c", "d!e"], group_size=2
+    )
+    assert "".join(letters) == "AB CD E"
+
+
+def test_key_letters():
+    """Test keyed letters join up into the keyed signal of the text."""
+    chunks = list(transmit.key_letters("AB CD"))
+    assert len(chunks) == 4
+    assert all(chunk.dtype == np.dtype("int16") for chunk in chunks)
+
+    audio_exp = transmit.AMPLITUDE * modulate(text_to_signal("AB CD"))
+    np.testing.assert_array_equal(
+        np.concatenate(chunks), audio_exp.astype(np.int16)
+    )
+
+
+def test_buffer_audio():
+    """Test audio chunks are joined into buffers of at least a given size."""
+    chunks = [np.full(3, i, dtype=np.int16) for i in range(5)]
+    buffers = list(transmit.buffer_audio(chunks, 7))
+    assert [buffer.size for buffer in buffers] == [9, 6]
+    np.testing.assert_array_equal(
+        np.concatenate(buffers), np.concatenate(chunks)
+    )
+
+
+def test_transmit():
+    """Test the threaded pipeline produces one audio chunk per letter."""
+    chunks = list(transmit.transmit(MockEnigma(), ["abcdefg"]))
+    assert len(chunks) == 7